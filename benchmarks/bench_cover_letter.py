@@ -0,0 +1,56 @@
+"""
+Measure generate_cover_letter_tool latency in "two_step" mode (separate metadata
+extraction call, the previous behaviour) and "single" mode (metadata extracted in
+the same request). Calls the real Azure OpenAI deployment, so the AZURE_OPENAI_*
+variables must be set. Each run uses a distinct job description so the metadata
+cache never short-circuits the comparison.
+
+    python benchmarks/bench_cover_letter.py [--runs 5]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "server"))
+
+from tools.resume import generate_cover_letter_tool
+
+RESUME = """Jane Doe
+jane.doe@example.com | (910) 555-0100 | Wilmington, NC
+Data Analyst, Coastal Logistics (2022-present): built Python/SQL reporting pipelines, cut report time 60%.
+B.S. Computer Science, UNCW, 2022. Skills: Python, SQL, pandas, Tableau, AWS."""
+
+JOB_DESCRIPTION = """Data Engineer (run {run}) at Acme Analytics, Raleigh, NC.
+Build and operate batch and streaming data pipelines in Python and SQL on AWS.
+Requirements: 2+ years of data engineering, Airflow, dbt, strong SQL, cloud experience."""
+
+
+async def measure(mode: str, runs: int) -> list:
+    timings = []
+    for run in range(runs):
+        job_description = JOB_DESCRIPTION.format(run=f"{mode}-{run}-{time.time()}")
+        start = time.perf_counter()
+        result = json.loads(await generate_cover_letter_tool(RESUME, job_description, mode=mode))
+        timings.append(time.perf_counter() - start)
+        if "error" in result:
+            print(f"{mode} run {run}: {result['error']}")
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'mean s':>8} {'p50 s':>8} {'max s':>8}")
+    for mode in ("two_step", "single"):
+        timings = await measure(mode, args.runs)
+        print(f"{mode:<10} {statistics.mean(timings):>8.2f} {statistics.median(timings):>8.2f} {max(timings):>8.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
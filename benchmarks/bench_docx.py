@@ -0,0 +1,278 @@
+"""
+Benchmark DOCX rendering: documents per second, output size and peak RSS of
+tools.docx_render (preloaded, pre-styled templates with named styles) against the
+previous create_resume_docx / create_cover_letter_docx, which built a fresh
+Document() and formatted every run by hand.
+
+Each renderer runs in its own process so peak RSS is measured independently.
+
+    python benchmarks/bench_docx.py [--docs 200]
+"""
+import io
+import os
+import sys
+import time
+import resource
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "server"))
+
+from docx import Document
+from docx.shared import Pt, Inches, RGBColor
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from tools.docx_render import render_resume, render_cover_letter
+
+RESUME = {
+    "name": "Jane Doe",
+    "contact": {"email": "jane.doe@example.com", "phone": "(910) 555-0100", "location": "Wilmington, NC", "linkedin": "linkedin.com/in/janedoe"},
+    "summary": "Data analyst with three years of experience building Python and SQL reporting pipelines. " * 3,
+    "experience": [
+        {
+            "title": f"Data Analyst {i}",
+            "company": "Coastal Logistics",
+            "location": "Wilmington, NC",
+            "dates": "2022 - Present",
+            "responsibilities": [f"Built reporting pipeline {j} in Python and SQL, cutting report time by {10 * j}%." for j in range(5)],
+        }
+        for i in range(3)
+    ],
+    "education": [{"degree": "B.S. Computer Science", "school": "UNCW", "location": "Wilmington, NC", "graduation": "2022"}],
+    "skills": ["Python", "SQL", "pandas", "Tableau", "AWS", "Airflow", "dbt"],
+}
+
+COVER_LETTER = {
+    "name": "Jane Doe",
+    "contact": {"email": "jane.doe@example.com", "phone": "(910) 555-0100", "address": "Wilmington, NC"},
+    "date": "October 17, 2026",
+    "recipient": {"name": "Hiring Manager", "company": "Acme Analytics", "address": "Raleigh, NC"},
+    "body_paragraphs": ["I am excited to apply for the Data Engineer role at Acme Analytics. " * 4] * 4,
+}
+
+def add_section_heading(doc: Document, text: str):
+    """Add a formatted section heading (compact for one-page layout)"""
+    heading = doc.add_paragraph(text)
+    heading_run = heading.runs[0]
+    heading_run.font.size = Pt(11)
+    heading_run.font.bold = True
+    heading_run.font.color.rgb = RGBColor(0, 0, 0)
+    heading.paragraph_format.space_before = Pt(6)
+    heading.paragraph_format.space_after = Pt(4)
+
+
+def legacy_resume_docx(data: dict) -> bytes:
+    """create_resume_docx before tools.docx_render: fresh Document() and per-run formatting."""
+    doc = Document()
+
+    # Set tight margins
+    sections = doc.sections
+    for section in sections:
+        section.top_margin = Inches(0.4)
+        section.bottom_margin = Inches(0.4)
+        section.left_margin = Inches(0.5)
+        section.right_margin = Inches(0.5)
+
+    # Name
+    name_para = doc.add_paragraph(data.get("name", ""))
+    name_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    if name_para.runs:
+        name_run = name_para.runs[0]
+        name_run.font.size = Pt(16)
+        name_run.font.bold = True
+    name_para.paragraph_format.space_after = Pt(2)
+
+    # Contact
+    contact = data.get("contact", {})
+    contact_parts = []
+    if contact.get("email"):
+        contact_parts.append(contact["email"])
+    if contact.get("phone"):
+        contact_parts.append(contact["phone"])
+    if contact.get("location"):
+        contact_parts.append(contact["location"])
+    if contact.get("linkedin"):
+        contact_parts.append(contact["linkedin"])
+
+    if contact_parts:
+        contact_para = doc.add_paragraph(" | ".join(contact_parts))
+        contact_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        if contact_para.runs:
+            contact_para.runs[0].font.size = Pt(9)
+        contact_para.paragraph_format.space_after = Pt(6)
+
+    # Summary
+    if data.get("summary"):
+        add_section_heading(doc, "PROFESSIONAL SUMMARY")
+        summary_para = doc.add_paragraph(data["summary"])
+        summary_para.paragraph_format.space_after = Pt(6)
+        for run in summary_para.runs:
+            run.font.size = Pt(10)
+
+    # Education
+    if data.get("education"):
+        add_section_heading(doc, "EDUCATION")
+        for edu in data["education"]:
+            edu_para = doc.add_paragraph()
+            edu_para.paragraph_format.space_after = Pt(1)
+            degree_run = edu_para.add_run(edu.get("degree", ""))
+            degree_run.bold = True
+            degree_run.font.size = Pt(10)
+
+            school_para = doc.add_paragraph(
+                f"{edu.get('school', '')} - {edu.get('location', '')} | {edu.get('graduation', '')}"
+            )
+            school_para.paragraph_format.space_after = Pt(4)
+            if school_para.runs:
+                school_para.runs[0].font.size = Pt(9)
+
+    # Experience
+    if data.get("experience"):
+        add_section_heading(doc, "EXPERIENCE")
+        for i, exp in enumerate(data["experience"]):
+            title_para = doc.add_paragraph()
+            title_para.paragraph_format.space_after = Pt(1)
+            title_run = title_para.add_run(f"{exp.get('title', '')} - {exp.get('company', '')}")
+            title_run.bold = True
+            title_run.font.size = Pt(10)
+
+            details_para = doc.add_paragraph()
+            details_para.paragraph_format.space_after = Pt(2)
+            details_run = details_para.add_run(
+                f"{exp.get('location', '')} | {exp.get('dates', '')}"
+            )
+            details_run.italic = True
+            details_run.font.size = Pt(9)
+
+            if exp.get("responsibilities"):
+                for resp in exp["responsibilities"]:
+                    try:
+                        bullet_para = doc.add_paragraph(resp, style="List Bullet")
+                    except KeyError:
+                        bullet_para = doc.add_paragraph(f"• {resp}")
+                    
+                    bullet_para.paragraph_format.space_after = Pt(1)
+                    bullet_para.paragraph_format.line_spacing = 1.0
+                    for run in bullet_para.runs:
+                        run.font.size = Pt(10)
+
+            if i < len(data["experience"]) - 1:
+                doc.add_paragraph().paragraph_format.space_after = Pt(4)
+
+    # Skills
+    if data.get("skills"):
+        add_section_heading(doc, "SKILLS")
+        skills_para = doc.add_paragraph(", ".join(data["skills"]))
+        for run in skills_para.runs:
+            run.font.size = Pt(10)
+
+    # Render in memory
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy_cover_letter_docx(data: dict) -> bytes:
+    """create_cover_letter_docx before tools.docx_render."""
+    doc = Document()
+
+    # Set normal margins
+    sections = doc.sections
+    for section in sections:
+        section.top_margin = Inches(1)
+        section.bottom_margin = Inches(1)
+        section.left_margin = Inches(1)
+        section.right_margin = Inches(1)
+
+    # Applicant Name
+    name_para = doc.add_paragraph(data.get("name", ""))
+    if name_para.runs:
+        name_para.runs[0].font.size = Pt(12)
+        name_para.runs[0].font.bold = True
+    name_para.paragraph_format.space_after = Pt(0)
+
+    # Contact
+    contact = data.get("contact", {})
+    if contact.get("address"):
+        doc.add_paragraph(contact["address"]).paragraph_format.space_after = Pt(0)
+    if contact.get("phone"):
+        doc.add_paragraph(contact["phone"]).paragraph_format.space_after = Pt(0)
+    if contact.get("email"):
+        doc.add_paragraph(contact["email"]).paragraph_format.space_after = Pt(12)
+
+    # Date
+    if data.get("date"):
+        doc.add_paragraph(data["date"]).paragraph_format.space_after = Pt(12)
+
+    # Recipient
+    recipient = data.get("recipient", {})
+    if recipient:
+        for key in ["name", "title", "company", "address"]:
+            if recipient.get(key):
+                doc.add_paragraph(recipient[key]).paragraph_format.space_after = Pt(0)
+        doc.add_paragraph().paragraph_format.space_after = Pt(12)
+
+    # Body
+    if data.get("body_paragraphs"):
+        for paragraph in data["body_paragraphs"]:
+            p = doc.add_paragraph(paragraph)
+            p.paragraph_format.space_after = Pt(12)
+            p.paragraph_format.line_spacing = 1.15
+
+    # Closing
+    doc.add_paragraph("Sincerely,").paragraph_format.space_after = Pt(12)
+    doc.add_paragraph(data.get("name", ""))
+
+    # Render in memory
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+RENDERERS = {
+    "legacy": (legacy_resume_docx, legacy_cover_letter_docx),
+    "docx_render": (render_resume, render_cover_letter),
+}
+
+
+def measure(renderer: str, docs: int) -> dict:
+    """Render docs resumes and docs cover letters in this (fresh) process."""
+    resume, cover_letter = RENDERERS[renderer]
+    # First document pays one-time setup (imports, template build); report it separately
+    start = time.perf_counter()
+    resume(RESUME)
+    first = time.perf_counter() - start
+
+    sizes = []
+    start = time.perf_counter()
+    for _ in range(docs):
+        sizes.append(len(resume(RESUME)))
+        sizes.append(len(cover_letter(COVER_LETTER)))
+    elapsed = time.perf_counter() - start
+    return {
+        "docs_per_sec": 2 * docs / elapsed,
+        "first_ms": first * 1000,
+        "avg_kb": sum(sizes) / len(sizes) / 1024,
+        # ru_maxrss is in KB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.docs} resumes + {args.docs} cover letters per renderer\n")
+    print(f"{'renderer':<14} {'docs/sec':>10} {'first ms':>10} {'avg KB':>8} {'peak RSS MB':>12}")
+    for renderer in RENDERERS:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            result = pool.submit(measure, renderer, args.docs).result()
+        print(
+            f"{renderer:<14} {result['docs_per_sec']:>10.1f} {result['first_ms']:>10.1f} "
+            f"{result['avg_kb']:>8.1f} {result['peak_rss_mb']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark job-page text extraction: throughput and extracted-text quality of
+tools.extract.extract_job_text (per available parser) against the previous
+BeautifulSoup html.parser path in web_scraper.
+
+Pages are synthetic but shaped like the real sites (heavy navigation and footer
+markup, site-specific description containers, JSON-LD JobPosting blocks), so the
+benchmark runs offline and is repeatable.
+
+    python benchmarks/bench_extract.py [--rounds 20]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "server"))
+
+from bs4 import BeautifulSoup
+from tools.extract import extract_job_text, available_parsers
+
+DESCRIPTION = [
+    f"Responsibility {i}: design, build and operate data pipelines for team {i} using Python and SQL."
+    for i in range(40)
+]
+BOILERPLATE = [f"Navigation link {i} for browse jobs and company reviews" for i in range(300)]
+
+
+def baseline_extract(html: str) -> str:
+    """The extraction path scrape_job_description_tool used before tools.extract."""
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup(["script", "style"]):
+        script.decompose()
+    text = soup.get_text(separator="\n")
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = '\n'.join(chunk for chunk in chunks if chunk)
+    return text[:10000]
+
+
+def _chrome(body: str, head: str = "") -> str:
+    nav = "".join(f"<li><a href='/l{i}'>{line}</a></li>" for i, line in enumerate(BOILERPLATE))
+    scripts = "<script>var tracking = {};" + "x=1;" * 2000 + "</script>"
+    return (
+        f"<html><head><title>Job</title>{head}{scripts}<style>body{{}}</style></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>{body}"
+        f"<footer><p>{' '.join(BOILERPLATE[:50])}</p></footer></body></html>"
+    )
+
+
+def _description_html() -> str:
+    return "<h2>About the role</h2><ul>" + "".join(f"<li>{line}</li>" for line in DESCRIPTION) + "</ul>"
+
+
+def build_pages() -> list:
+    posting = {
+        "@context": "https://schema.org",
+        "@type": "JobPosting",
+        "title": "Data Engineer",
+        "hiringOrganization": {"@type": "Organization", "name": "Acme"},
+        "jobLocation": {"@type": "Place", "address": {"addressLocality": "Wilmington", "addressRegion": "NC"}},
+        "description": _description_html(),
+    }
+    json_ld = f"<script type='application/ld+json'>{json.dumps(posting)}</script>"
+    sidebar = "<div class='sidebar'>" + "".join(f"<p>{line}</p>" for line in BOILERPLATE[:100]) + "</div>"
+    return [
+        ("https://www.indeed.com/viewjob?jk=1", _chrome(f"{sidebar}<div id='jobDescriptionText'>{_description_html()}</div>")),
+        ("https://www.linkedin.com/jobs/view/1", _chrome(f"{sidebar}<div class='show-more-less-html__markup'>{_description_html()}</div>")),
+        ("https://www.ziprecruiter.com/c/Acme/Job/1", _chrome(f"{sidebar}<div class='job_description'>{_description_html()}</div>")),
+        ("https://boards.greenhouse.io/acme/jobs/1", _chrome(f"{sidebar}<div id='app'></div>", head=json_ld)),
+        ("https://jobs.lever.co/acme/1", _chrome(f"{sidebar}<div class='section-wrapper page-full-width'>{_description_html()}</div>")),
+        ("https://careers.example.com/jobs/1", _chrome(f"{sidebar}<main>{_description_html()}</main>")),
+        # ASP.NET WebForms: the whole body sits inside one <form>
+        ("https://careers.example.net/job.aspx?id=1", _chrome(
+            f"<form id='aspnetForm' method='post'>{sidebar}<div id='content'>{_description_html()}</div></form>"
+        )),
+    ]
+
+
+def quality(text: str) -> tuple:
+    """(recall of description lines, fraction of output lines that are boilerplate)."""
+    recall = sum(1 for line in DESCRIPTION if line in text) / len(DESCRIPTION)
+    lines = [line for line in text.splitlines() if line.strip()]
+    noise = sum(1 for line in lines if line.startswith("Navigation link")) / max(len(lines), 1)
+    return recall, noise
+
+
+def run(name: str, extract, pages: list, rounds: int):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for url, html in pages:
+            extract(html, url)
+        timings.append(time.perf_counter() - start)
+
+    scores = [quality(extract(html, url)) for url, html in pages]
+    pages_per_sec = len(pages) / statistics.median(timings)
+    recall = statistics.mean(score[0] for score in scores)
+    noise = statistics.mean(score[1] for score in scores)
+    print(f"{name:<28} {pages_per_sec:>10.1f} {recall:>10.0%} {noise:>10.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = build_pages()
+    size_kb = sum(len(html) for _, html in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {size_kb:.0f} KB average, {args.rounds} rounds\n")
+    print(f"{'extractor':<28} {'pages/sec':>10} {'recall':>10} {'noise':>10}")
+
+    run("baseline (html.parser)", lambda html, url: baseline_extract(html), pages, args.rounds)
+    for name in available_parsers():
+        run(f"extract_job_text/{name}", lambda html, url, name=name: extract_job_text(html, url, parser=name), pages, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,8 @@ import logging
 import asyncio
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
-from openai import AzureOpenAI
 from dotenv import load_dotenv
+from client_streamlit.llm import create_async_azure_client
 import json
 from datetime import datetime
 import aiohttp
@@ -31,21 +29,116 @@ from slack_sdk.web.async_client import AsyncWebClient
 client_slack = AsyncWebClient(token=os.environ.get("SLACK_BOT_TOKEN"), ssl=ssl_context)
 app = AsyncApp(client=client_slack)
 
-# Initialize Azure OpenAI Client
-client = AzureOpenAI(
-    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-    api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
-    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-)
-deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
+# Initialize Azure OpenAI Client (async, so model latency doesn't block the Socket Mode loop)
+client = create_async_azure_client()
 
 # Store user context (resume text)
 user_context = {}
 
-import io
-from client_streamlit.prompts import build_enhanced_system_prompt
+from client_streamlit.mcp_pool import MCPSessionPool
+from client_streamlit.orchestrator import ChatOrchestrator, ChatSink
+from client_streamlit.resume_ingest import get_resume_parser
+
+# Shared MCP connection pool, message limiter and chat engine, created in main()
+mcp_pool = None
+dispatcher = None
+orchestrator = None
+
+
+class MessageDispatcher:
+    """
+    Runs message handlers as background tasks with a global in-flight cap, a per-key
+    (user/channel) in-flight cap, and a bound on queued work. Messages over the
+    per-key or global cap wait their turn; once max_pending is reached new
+    messages are rejected instead of piling up.
+    """
+
+    def __init__(self, max_in_flight: int, max_in_flight_per_key: int, max_pending: int):
+        self.max_in_flight_per_key = max_in_flight_per_key
+        self.max_pending = max_pending
+        self._global = asyncio.Semaphore(max_in_flight)
+        self._per_key = {}
+        self._key_counts = {}
+        self._pending = 0
+        self._tasks = set()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_in_flight=int(os.getenv("SLACK_MAX_IN_FLIGHT", "8")),
+            max_in_flight_per_key=int(os.getenv("SLACK_MAX_IN_FLIGHT_PER_USER", "1")),
+            max_pending=int(os.getenv("SLACK_MAX_PENDING", "100")),
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, key, coro) -> bool:
+        """Schedule coro under the limits for key. Returns False if the queue is full."""
+        if self._pending >= self.max_pending:
+            coro.close()
+            return False
+
+        self._pending += 1
+        self._key_counts[key] = self._key_counts.get(key, 0) + 1
+        if key not in self._per_key:
+            self._per_key[key] = asyncio.Semaphore(self.max_in_flight_per_key)
+
+        task = asyncio.create_task(self._run(key, coro))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _run(self, key, coro):
+        try:
+            async with self._per_key[key]:
+                async with self._global:
+                    await coro
+        except Exception as e:
+            logger.exception(f"Error handling message for {key}: {e}")
+        finally:
+            self._pending -= 1
+            self._key_counts[key] -= 1
+            if self._key_counts[key] == 0:
+                del self._key_counts[key]
+                del self._per_key[key]
+
+    async def drain(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+class LiveMessage:
+    """
+    A Slack message that is posted once and then edited in place as new text arrives.
+    Edits are throttled to one per `interval` seconds to stay within Slack's rate limits;
+    finish() always writes the final text.
+    """
+
+    def __init__(self, channel: str, interval: float = None):
+        self.channel = channel
+        self.interval = interval if interval is not None else float(os.getenv("SLACK_STREAM_UPDATE_INTERVAL", "1.0"))
+        self.ts = None
+        self._text = None
+        self._last_update = 0.0
+
+    async def update(self, text: str, force: bool = False):
+        if not text or text == self._text:
+            return
+        now = asyncio.get_running_loop().time()
+        if self.ts is None:
+            response = await app.client.chat_postMessage(channel=self.channel, text=text)
+            self.ts = response["ts"]
+        elif force or now - self._last_update >= self.interval:
+            await app.client.chat_update(channel=self.channel, ts=self.ts, text=text)
+        else:
+            return
+        self._text = text
+        self._last_update = now
+
+    async def finish(self, text: str):
+        await self.update(text, force=True)
 
-# build_enhanced_system_prompt is now imported from server.prompts
 
 async def download_file(file_url, token):
     headers = {"Authorization": f"Bearer {token}"}
@@ -59,7 +152,6 @@ async def download_file(file_url, token):
 async def handle_message_events(body, logger, say):
     event = body.get("event", {})
     user_id = event.get("user")
-    text = event.get("text", "")
     files = event.get("files", [])
     
     # Handle file uploads (Resume)
@@ -68,27 +160,15 @@ async def handle_message_events(body, logger, say):
             file_type = file.get("filetype")
             if file_type in ["text", "markdown", "pdf", "docx"]:
                 content_bytes = await download_file(file.get("url_private"), os.environ.get("SLACK_BOT_TOKEN"))
-                
+
                 if content_bytes:
-                    text_content = ""
                     try:
-                        if file_type in ["text", "markdown"]:
-                            text_content = content_bytes.decode("utf-8")
-                        elif file_type == "pdf":
-                            import pypdf
-                            pdf_file = io.BytesIO(content_bytes)
-                            pdf_reader = pypdf.PdfReader(pdf_file)
-                            for page in pdf_reader.pages:
-                                text_content += page.extract_text() + "\n"
-                        elif file_type == "docx":
-                            import docx
-                            docx_file = io.BytesIO(content_bytes)
-                            doc = docx.Document(docx_file)
-                            for para in doc.paragraphs:
-                                text_content += para.text + "\n"
-                        
-                        user_context[user_id] = text_content
-                        await say(f"Resume received and processed! I've stored it for this session.")
+                        # Parsed off the event loop and cached by content, so re-uploads are free
+                        parsed = await get_resume_parser().parse(
+                            content_bytes, file.get("name") or f"resume.{file_type}", file_type
+                        )
+                        user_context[user_id] = parsed["text"]
+                        await say("Resume received and processed! I've stored it for this session.")
                     except Exception as e:
                         logger.error(f"Error parsing file: {e}")
                         await say(f"Error processing file: {str(e)}")
@@ -96,139 +176,114 @@ async def handle_message_events(body, logger, say):
                     await say("Failed to download resume.")
         return
 
+    key = (user_id, event.get("channel"))
+    if not dispatcher.submit(key, process_message(event, say)):
+        await say("I'm handling a lot of requests right now. Please try again in a moment.")
+
+
+class SlackSink(ChatSink):
+    """
+    Renders a chat turn in Slack: the reply streams into one message, each tool call gets
+    a status message edited in place with its progress, and generated documents are posted.
+    """
+
+    def __init__(self, event, say):
+        self.channel = event.get("channel")
+        self.say = say
+        self.reply = LiveMessage(self.channel)
+        self.reply_text = ""
+        self.statuses = {}
+        self.uploaded = set()
+
+    async def on_text(self, delta):
+        self.reply_text += delta
+        await self.reply.update(self.reply_text)
+
+    async def on_tool_start(self, call):
+        self.statuses[call["id"]] = LiveMessage(self.channel)
+        await self.statuses[call["id"]].update(f"Thinking... (Calling {call['function']['name']})")
+
+    async def on_tool_progress(self, call, message):
+        name = call["function"]["name"]
+        if name in ["tailor_resume", "generate_cover_letter"]:
+            await self.statuses[call["id"]].update(f"*Preview:*\n{message}")
+        else:
+            await self.statuses[call["id"]].update(f"Thinking... (Calling {name})\n{message}")
+
+    async def on_artifact(self, call, filename, content):
+        # The document bytes were fetched by reference from the server's artifact store
+        try:
+            await app.client.files_upload_v2(
+                channel=self.channel,
+                content=content,
+                filename=filename,
+                title=filename,
+                initial_comment=f"Here is your {filename}!"
+            )
+            self.uploaded.add(call["id"])
+        except Exception as e:
+            logger.error(f"Error uploading file to Slack: {e}")
+            await self.say(f"Error uploading file: {e}")
+
+    async def on_tool_result(self, call, content):
+        # Handle file generation tools specifically
+        if call["function"]["name"] not in ["tailor_resume", "generate_cover_letter"]:
+            return content
+        try:
+            # Parse the JSON output from the tool
+            data = json.loads(content)
+        except json.JSONDecodeError:
+            # Fallback if not JSON (e.g. a timeout error)
+            return content
+
+        try:
+            # 1. Send Preview
+            if "preview" in data:
+                await self.statuses[call["id"]].finish(f"*Preview:*\n{data['preview']}")
+
+            # Tell the LLM whether the document reached the user
+            if call["id"] in self.uploaded:
+                return "File generated and uploaded to Slack successfully."
+            return data.get("error") or "The document was generated but could not be uploaded to Slack."
+        except Exception as e:
+            logger.error(f"Error processing tool output: {e}")
+            return f"Error processing output: {e}"
+
+    async def on_finish(self, reply):
+        await self.reply.finish(reply)
+
+
+async def process_message(event, say):
+    user_id = event.get("user")
+    text = event.get("text", "")
+
     # Prepare context
     resume_text = user_context.get(user_id, "No resume uploaded yet.")
-    
-    # Run MCP interaction
-    mcp_server_url = os.getenv("MCP_SERVER_URL")
-
-    if mcp_server_url:
-        from mcp.client.sse import sse_client
-        client_context = sse_client(mcp_server_url)
-    else:
-        server_params = StdioServerParameters(
-            command=sys.executable,
-            args=["server/main.py"],
-            env=os.environ.copy()
-        )
-        client_context = stdio_client(server_params)
-
-    async with client_context as (read, write):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            
-            # List tools
-            tools = await session.list_tools()
-            openai_tools = []
-            for tool in tools.tools:
-                openai_tools.append({
-                    "type": "function",
-                    "function": {
-                        "name": tool.name,
-                        "description": tool.description,
-                        "parameters": tool.inputSchema
-                    }
-                })
-            
-            # Add local tool for uploading DOCX - REMOVED as server tools now handle file generation
-            # openai_tools.append({...})
-
-            # Prepare messages
-            system_prompt = build_enhanced_system_prompt(resume_text, openai_tools)
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text}
-            ]
-
-            # Call LLM
-            response = client.chat.completions.create(
-                model=deployment_name,
-                messages=messages,
-                tools=openai_tools,
-                tool_choice="auto"
-            )
-            
-            response_message = response.choices[0].message
-            
-            if response_message.tool_calls:
-                messages.append(response_message)
-                
-                for tool_call in response_message.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-                    
-                    await say(f"Thinking... (Calling {function_name})")
-                    
-                    # Call MCP tool
-                    result = await session.call_tool(function_name, arguments=function_args)
-                    
-                    # Handle file generation tools specifically
-                    if function_name in ["tailor_resume", "generate_cover_letter"]:
-                        try:
-                            # Parse the JSON output from the tool
-                            content_str = ""
-                            if hasattr(result, 'content') and isinstance(result.content, list):
-                                content_str = result.content[0].text
-                            else:
-                                content_str = str(result.content)
-                                
-                            data = json.loads(content_str)
-                            
-                            # 1. Send Preview
-                            if "preview" in data:
-                                await say(f"*Preview:*\n{data['preview']}")
-                                
-                            # 2. Upload File
-                            if "file_path" in data and "filename" in data:
-                                file_path = data["file_path"]
-                                filename = data["filename"]
-                                
-                                try:
-                                    await app.client.files_upload_v2(
-                                        channel=event.get("channel"),
-                                        file=file_path,
-                                        filename=filename,
-                                        title=filename,
-                                        initial_comment=f"Here is your {filename}!"
-                                    )
-                                except Exception as e:
-                                    logger.error(f"Error uploading file to Slack: {e}")
-                                    await say(f"Error uploading file: {e}")
-                                    
-                            # Update content for LLM to know it succeeded
-                            result_content = "File generated and uploaded to Slack successfully."
-                            
-                        except json.JSONDecodeError:
-                            # Fallback if not JSON
-                            result_content = str(result.content)
-                        except Exception as e:
-                            logger.error(f"Error processing tool output: {e}")
-                            result_content = f"Error processing output: {e}"
-                    else:
-                        # Standard handling for other tools
-                        if hasattr(result, 'content') and isinstance(result.content, list):
-                            result_content = result.content[0].text
-                        else:
-                            result_content = str(result.content)
-
-                    messages.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": result_content
-                    })
-                
-                second_response = client.chat.completions.create(
-                    model=deployment_name,
-                    messages=messages
-                )
-                await say(second_response.choices[0].message.content)
-            else:
-                await say(response_message.content)
+
+    # Pooled MCP session, streaming, tool calls and timeouts are handled by the shared orchestrator
+    await orchestrator.run([{"role": "user", "content": text}], resume_text, SlackSink(event, say))
 
 async def main():
+    global mcp_pool, dispatcher, orchestrator
+
+    # Connections are shared by every in-flight message, so SLACK_MAX_IN_FLIGHT alone bounds concurrency
+    mcp_pool = MCPSessionPool.from_env()
+    dispatcher = MessageDispatcher.from_env()
+    orchestrator = ChatOrchestrator.from_env(mcp_pool, client)
+
+    # Warm up one connection and the tool cache so the first message doesn't pay for it
+    try:
+        await mcp_pool.list_tools()
+    except Exception as e:
+        logger.warning(f"MCP server not reachable at startup, will retry on first message: {e}")
+
     handler = AsyncSocketModeHandler(app, os.environ["SLACK_APP_TOKEN"])
-    await handler.start_async()
+    try:
+        await handler.start_async()
+    finally:
+        await dispatcher.drain()
+        await mcp_pool.close()
+        get_resume_parser().close()
 
 if __name__ == "__main__":
     asyncio.run(main())
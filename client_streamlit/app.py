@@ -3,17 +3,17 @@ import asyncio
 import os
 import sys
 import threading
+import queue
 import tempfile
 import uuid
 from pathlib import Path
 from datetime import datetime
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
-from openai import AzureOpenAI
 from dotenv import load_dotenv
-import io
-import base64
-from prompts import build_enhanced_system_prompt
+import hashlib
+from mcp_pool import MCPSessionPool
+from llm import create_async_azure_client
+from orchestrator import ChatOrchestrator, ChatSink
+from resume_ingest import get_resume_parser
 
 # Load environment variables
 load_dotenv()
@@ -21,14 +21,6 @@ load_dotenv()
 # Page configuration
 st.set_page_config(page_title="Job Assistant", layout="wide")
 
-# Initialize Azure OpenAI Client
-client = AzureOpenAI(
-    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-    api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
-    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-)
-deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
-
 # -----------------------------------------------------------------------------
 # 1. Threaded Event Loop
 # -----------------------------------------------------------------------------
@@ -42,6 +34,36 @@ def get_event_loop():
     thread.start()
     return loop
 
+# -----------------------------------------------------------------------------
+# 2. Shared MCP Session Pool (lives on the threaded event loop)
+# -----------------------------------------------------------------------------
+@st.cache_resource
+def get_mcp_pool():
+    return MCPSessionPool.from_env()
+
+# -----------------------------------------------------------------------------
+# 3. Async Azure OpenAI Client (one pooled client, used only on the threaded loop)
+# -----------------------------------------------------------------------------
+@st.cache_resource
+def get_llm_client():
+    return create_async_azure_client()
+
+# -----------------------------------------------------------------------------
+# 4. Shared chat orchestration (same engine as the Slack bot)
+# -----------------------------------------------------------------------------
+@st.cache_resource
+def get_orchestrator():
+    return ChatOrchestrator.from_env(get_mcp_pool(), get_llm_client())
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Tools whose output is a downloadable document, and the sidebar label for it
+DOCUMENT_TOOLS = {
+    "tailor_resume": "resume",
+    "generate_cover_letter": "cover_letter",
+    "apply_to_jobs": "applications",
+}
+
 # -----------------------------------------------------------------------------
 # Session State Initialization
 # -----------------------------------------------------------------------------
@@ -54,8 +76,11 @@ if "resume_text" not in st.session_state:
 if "resume_path" not in st.session_state:
     st.session_state.resume_path = None
 
+if "resume_sha256" not in st.session_state:
+    st.session_state.resume_sha256 = None
+
 # persistent file state
-for key in ["last_generated_content", "last_generated_type", "last_generated_filename"]:
+for key in ["last_generated_content", "last_generated_type", "last_generated_filename", "last_generated_mime"]:
     if key not in st.session_state:
         st.session_state[key] = None
 
@@ -66,6 +91,7 @@ def clear_generated_state():
     st.session_state.last_generated_content = None
     st.session_state.last_generated_type = None
     st.session_state.last_generated_filename = None
+    st.session_state.last_generated_mime = None
 
 # -----------------------------------------------------------------------------
 # SIDEBAR — UPLOAD + PERSISTENT DOWNLOAD
@@ -92,32 +118,20 @@ with st.sidebar:
 
     if uploaded_file:
         try:
-            tmp_dir = Path(tempfile.gettempdir())
-            safe_name = f"{uuid.uuid4()}_{uploaded_file.name}"
-            resume_abs_path = tmp_dir / safe_name
-
-            with open(resume_abs_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-
-            st.session_state.resume_path = str(resume_abs_path)
-
-            ext = uploaded_file.name.split(".")[-1].lower()
-            text = ""
-
-            if ext in ["txt", "md"]:
-                text = uploaded_file.getvalue().decode("utf-8")
-            elif ext == "pdf":
-                import pypdf
-                pdf_reader = pypdf.PdfReader(io.BytesIO(uploaded_file.getvalue()))
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            elif ext in ["docx", "doc"]:
-                import docx
-                doc_obj = docx.Document(io.BytesIO(uploaded_file.getvalue()))
-                for para in doc_obj.paragraphs:
-                    text += para.text + "\n"
-
-            st.session_state.resume_text = text
+            data = uploaded_file.getvalue()
+            # The file stays in the uploader across reruns; only new content is parsed
+            # (and repeat uploads are answered from the parser's cache)
+            if st.session_state.resume_sha256 != hashlib.sha256(data).hexdigest():
+                parsed = asyncio.run_coroutine_threadsafe(
+                    get_resume_parser().parse(data, uploaded_file.name), get_event_loop()
+                ).result()
+
+                resume_abs_path = Path(tempfile.gettempdir()) / f"{uuid.uuid4()}_{uploaded_file.name}"
+                resume_abs_path.write_bytes(data)
+
+                st.session_state.resume_path = str(resume_abs_path)
+                st.session_state.resume_text = parsed["text"]
+                st.session_state.resume_sha256 = parsed["sha256"]
             st.success("✅ Resume uploaded!")
 
         except Exception as e:
@@ -137,7 +151,7 @@ with st.sidebar:
             label=f"⬇ Download {label}",
             data=st.session_state.last_generated_content,
             file_name=filename,
-            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            mime=st.session_state.last_generated_mime or DOCX_MIME,
             key="persistent_download_button"
         )
     else:
@@ -157,87 +171,36 @@ for message in st.session_state.messages:
 # -----------------------------------------------------------------------------
 # ASYNC LOGIC
 # -----------------------------------------------------------------------------
-async def run_chat_logic(user_input):
-    mcp_server_url = os.getenv("MCP_SERVER_URL")
+class QueueSink(ChatSink):
+    """Hands streamed output from the background loop to the Streamlit thread via thread-safe queues."""
 
-    if mcp_server_url:
-        from mcp.client.sse import sse_client
-        client_context = sse_client(mcp_server_url)
-    else:
-        server_params = StdioServerParameters(
-            command=sys.executable,
-            args=["server/main.py"],
-            env=os.environ.copy()
-        )
-        client_context = stdio_client(server_params)
-
-    async with client_context as (read, write):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            tools = await session.list_tools()
-
-            openai_tools = [{
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": tool.inputSchema
-                }
-            } for tool in tools.tools]
-
-            system_prompt = build_enhanced_system_prompt(
-                st.session_state.resume_text,
-                openai_tools
-            )
-
-            messages = [{"role": "system", "content": system_prompt}] + st.session_state.messages
-
-            response = client.chat.completions.create(
-                model=deployment_name,
-                messages=messages,
-                tools=openai_tools,
-                tool_choice="auto"
-            )
-
-            response_message = response.choices[0].message
-            tool_outputs = []
-            final_response = ""
-
-            if response_message.tool_calls:
-                messages.append(response_message)
-
-                for call in response_message.tool_calls:
-                    import json
-                    args = json.loads(call.function.arguments)
-                    result = await session.call_tool(call.function.name, arguments=args)
-
-                    parts = []
-                    if hasattr(result, "content") and isinstance(result.content, list):
-                        for item in result.content:
-                            if hasattr(item, "text"):
-                                parts.append(item.text)
-                            else:
-                                parts.append(str(item))
-                        content = "\n".join(parts)
-                    else:
-                        content = str(result)
-
-                    tool_outputs.append({"name": call.function.name, "content": content})
-
-                    messages.append({
-                        "tool_call_id": call.id,
-                        "role": "tool",
-                        "name": call.function.name,
-                        "content": content
-                    })
-
-                second = client.chat.completions.create(model=deployment_name, messages=messages)
-                final_response = second.choices[0].message.content
-
-            else:
-                final_response = response_message.content
-
-            return final_response, tool_outputs
+    def __init__(self, progress, tokens):
+        self.progress = progress
+        self.tokens = tokens
+
+    async def on_text(self, delta):
+        self.tokens.put(delta)
+
+    async def on_tool_progress(self, call, message):
+        self.progress.put(message)
+
+def stream_reply(future, progress, tokens, placeholder):
+    """
+    Yield reply tokens as they arrive until future completes (for st.write_stream),
+    rendering the latest tool progress message into placeholder meanwhile.
+    """
+    while not (future.done() and tokens.empty()):
+        try:
+            yield tokens.get(timeout=0.1)
+            continue
+        except queue.Empty:
+            pass
+        latest = None
+        while not progress.empty():
+            latest = progress.get_nowait()
+        if latest:
+            placeholder.markdown(latest)
+    placeholder.empty()
 
 # -----------------------------------------------------------------------------
 # CHAT INPUT HANDLER
@@ -250,16 +213,36 @@ if prompt := st.chat_input("How can I help you?"):
         st.markdown(prompt)
 
     with st.chat_message("assistant"):
+        progress_placeholder = st.empty()
         with st.spinner("Thinking..."):
             try:
-                final_response, tool_outputs = asyncio.run(run_chat_logic(prompt))
+                progress, tokens = queue.Queue(), queue.Queue()
+                # Runs on the background loop, so Streamlit state is passed in rather than read there
+                future = asyncio.run_coroutine_threadsafe(
+                    get_orchestrator().run(
+                        list(st.session_state.messages),
+                        st.session_state.resume_text,
+                        QueueSink(progress, tokens)
+                    ),
+                    get_event_loop()
+                )
+                reply_placeholder = st.empty()
+                with reply_placeholder.container():
+                    st.write_stream(stream_reply(future, progress, tokens, progress_placeholder))
+                result = future.result()
+                final_response, tool_outputs = result["reply"], result["tool_outputs"]
 
                 for output in tool_outputs:
                     content = output["content"]
 
-                    if output["name"] in ["tailor_resume", "generate_cover_letter"]:
+                    if output["name"] in DOCUMENT_TOOLS:
                         import json
-                        data = json.loads(content)
+                        try:
+                            data = json.loads(content)
+                        except json.JSONDecodeError:
+                            # e.g. a timeout reported by the orchestrator
+                            st.error(content)
+                            continue
 
                         if "error" in data:
                             st.error(f"Generation failed: {data['error']}")
@@ -267,13 +250,17 @@ if prompt := st.chat_input("How can I help you?"):
                         if "preview" in data:
                             st.markdown(data["preview"])
 
-                        if "file_content" in data:
-                            file_bytes = base64.b64decode(data["file_content"])
-                            st.session_state.last_generated_content = file_bytes
-                            st.session_state.last_generated_type = (
-                                "resume" if output["name"] == "tailor_resume" else "cover_letter"
-                            )
-                            st.session_state.last_generated_filename = data.get("filename")
+                        # Batch applications: one status line per job
+                        for job in data.get("jobs", []):
+                            status = "✅" if job["status"] == "ok" else f"❌ {job.get('error', '')}"
+                            st.markdown(f"- **{job['job']}** {status}")
+
+                        if output.get("artifact"):
+                            # Downloaded by reference from the server's artifact store
+                            st.session_state.last_generated_content = output["artifact"]["content"]
+                            st.session_state.last_generated_type = DOCUMENT_TOOLS[output["name"]]
+                            st.session_state.last_generated_filename = output["artifact"]["filename"]
+                            st.session_state.last_generated_mime = output["artifact"].get("mime_type")
                             
                             # Ensure the assistant's response is added to chat history before rerun
                             import re
@@ -290,13 +277,13 @@ if prompt := st.chat_input("How can I help you?"):
                             
                             st.rerun()
 
-                    elif output["name"] not in ["search_jobs", "scrape_job_description"]:
+                    elif output["name"] not in ["search_jobs", "search_saved_jobs", "get_job", "scrape_job_description", "scrape_job_descriptions"]:
                         st.markdown(content)
 
-                # Remove file path noise
+                # Remove file path noise (replaces the streamed copy of the reply)
                 import re
                 clean = re.sub(r"/tmp/[^\s]+\.docx", "", final_response)
-                st.markdown(clean)
+                reply_placeholder.markdown(clean)
 
                 st.session_state.messages.append({"role": "assistant", "content": clean})
 
@@ -0,0 +1,43 @@
+import os
+import json
+import base64
+import logging
+from urllib.parse import urljoin
+
+import httpx
+from pydantic import AnyUrl
+
+logger = logging.getLogger(__name__)
+
+
+def artifact_ref(content: str):
+    """Return the artifact reference in a tool result (generated documents), or None."""
+    try:
+        data = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    if isinstance(data, dict) and data.get("artifact_id") and data.get("uri"):
+        return data
+    return None
+
+
+async def fetch_artifact(session, ref: dict) -> bytes:
+    """
+    Download a generated document by reference: a plain HTTP GET of the server's
+    /artifacts endpoint when connected over SSE (raw bytes), otherwise an MCP
+    resources/read of its artifact:// URI on the given session.
+    """
+    server_url = os.getenv("MCP_SERVER_URL")
+    if server_url and ref.get("path"):
+        async with httpx.AsyncClient(timeout=float(os.getenv("ARTIFACT_FETCH_TIMEOUT", "30"))) as http:
+            response = await http.get(urljoin(server_url, ref["path"]))
+            response.raise_for_status()
+            return response.content
+
+    result = await session.read_resource(AnyUrl(ref["uri"]))
+    for item in result.contents:
+        if getattr(item, "blob", None):
+            return base64.b64decode(item.blob)
+        if getattr(item, "text", None):
+            return item.text.encode("utf-8")
+    raise ValueError(f"Artifact {ref['artifact_id']} has no content")
@@ -0,0 +1,73 @@
+import os
+import sys
+
+import httpx
+from openai import AsyncAzureOpenAI
+
+try:
+    from server.tools.rate_limit import RateLimiter, rate_limited
+except ImportError:
+    # Run as `streamlit run client_streamlit/app.py`: only client_streamlit/ is on sys.path
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from server.tools.rate_limit import RateLimiter, rate_limited
+
+
+def create_async_azure_client() -> AsyncAzureOpenAI:
+    """
+    Create an AsyncAzureOpenAI client backed by a connection-pooled httpx client, with
+    chat completions rate limited and retried (see server/tools/rate_limit.py).
+
+    The client must only be used from one event loop; create one per loop and reuse it.
+    """
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("AZURE_OPENAI_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("AZURE_OPENAI_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(os.getenv("AZURE_OPENAI_KEEPALIVE_EXPIRY", "60")),
+        ),
+        timeout=httpx.Timeout(
+            float(os.getenv("AZURE_OPENAI_TIMEOUT", "120")),
+            connect=float(os.getenv("AZURE_OPENAI_CONNECT_TIMEOUT", "10")),
+        ),
+    )
+    client = AsyncAzureOpenAI(
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        http_client=http_client,
+    )
+    # Every chat completion goes through one limiter per process (AZURE_OPENAI_RPM / TPM)
+    return rate_limited(client, RateLimiter.from_env())
+
+
+async def stream_chat_step(client: AsyncAzureOpenAI, on_text=None, **kwargs):
+    """
+    Run one streaming chat completion that may call tools. Text deltas are passed to
+    the async on_text callback as they arrive. Returns (content, tool_calls) where
+    tool_calls is a list of tool call dicts in chat message format (empty if none).
+    """
+    stream = await client.chat.completions.create(stream=True, **kwargs)
+    content = []
+    calls = {}
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            content.append(delta.content)
+            if on_text is not None:
+                await on_text(delta.content)
+        # Tool calls arrive in fragments keyed by index
+        for fragment in delta.tool_calls or []:
+            call = calls.setdefault(
+                fragment.index,
+                {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+            )
+            if fragment.id:
+                call["id"] = fragment.id
+            if fragment.function and fragment.function.name:
+                call["function"]["name"] += fragment.function.name
+            if fragment.function and fragment.function.arguments:
+                call["function"]["arguments"] += fragment.function.arguments
+
+    return "".join(content), [calls[index] for index in sorted(calls)]
@@ -0,0 +1,214 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import contextlib
+
+import anyio
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the underlying transport is gone and the connection must be rebuilt
+TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+    McpError,
+)
+
+
+def open_transport():
+    """Return an MCP transport context (SSE if MCP_SERVER_URL is set, otherwise a stdio subprocess)."""
+    mcp_server_url = os.getenv("MCP_SERVER_URL")
+
+    if mcp_server_url:
+        from mcp.client.sse import sse_client
+        return sse_client(mcp_server_url)
+
+    env = os.environ.copy()
+    env["MCP_TRANSPORT"] = "stdio"
+    server_params = StdioServerParameters(
+        command=sys.executable,
+        args=["server/main.py"],
+        env=env
+    )
+    return stdio_client(server_params)
+
+
+class PooledConnection:
+    """
+    A single long-lived MCP connection.
+
+    The transport and ClientSession context managers are entered and exited by one
+    owner task, because anyio cancel scopes must not cross tasks.
+    """
+
+    def __init__(self, connect_timeout: float):
+        self.connect_timeout = connect_timeout
+        self.session = None
+        self.last_used = 0.0
+        self._owner = None
+        self._ready = None
+        self._stop = None
+        self._error = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._owner is not None and not self._owner.done()
+
+    async def connect(self):
+        await self.close()
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._error = None
+        self._owner = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), self.connect_timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise ConnectionError("Timed out connecting to MCP server")
+        if self._error is not None:
+            raise ConnectionError(f"Failed to connect to MCP server: {self._error}") from self._error
+        self.last_used = time.monotonic()
+
+    async def _run(self):
+        try:
+            async with open_transport() as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._stop.wait()
+        except Exception as e:
+            self._error = e
+            logger.warning(f"MCP connection closed: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def ping(self, timeout: float) -> bool:
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"MCP health check failed: {e}")
+            return False
+
+    async def close(self):
+        if self._owner is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(self._owner, 5)
+        except Exception:
+            self._owner.cancel()
+        self._owner = None
+        self.session = None
+
+
+class MCPSessionPool:
+    """
+    A fixed set of long-lived MCP ClientSessions with health checks,
+    reconnect-on-failure and a cached tool list.
+
+    A ClientSession multiplexes concurrent requests, so connections are shared
+    round-robin rather than lent out exclusively: any number of callers can use the
+    pool at once, and `size` only sets how many connections carry their traffic.
+
+    All methods must be awaited on the same event loop.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        health_check_interval: float = 30.0,
+        ping_timeout: float = 5.0,
+        connect_timeout: float = 30.0,
+        tools_ttl: float = 300.0,
+    ):
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self.tools_ttl = tools_ttl
+        self._connections = [PooledConnection(connect_timeout) for _ in range(size)]
+        self._next = 0
+        self._conn_locks = None
+        self._tools = None
+        self._tools_fetched_at = 0.0
+        self._tools_lock = None
+
+    @classmethod
+    def from_env(cls, **overrides):
+        settings = {
+            "size": int(os.getenv("MCP_POOL_SIZE", "2")),
+            "health_check_interval": float(os.getenv("MCP_HEALTH_CHECK_INTERVAL", "30")),
+            "ping_timeout": float(os.getenv("MCP_PING_TIMEOUT", "5")),
+            "connect_timeout": float(os.getenv("MCP_CONNECT_TIMEOUT", "30")),
+            "tools_ttl": float(os.getenv("MCP_TOOLS_TTL", "300")),
+        }
+        settings.update(overrides)
+        return cls(**settings)
+
+    def _ensure_locks(self):
+        # Created lazily so the pool can be constructed outside the loop that uses it
+        if self._conn_locks is None:
+            self._conn_locks = [asyncio.Lock() for _ in self._connections]
+            self._tools_lock = asyncio.Lock()
+
+    async def _acquire(self) -> tuple:
+        """Pick the next connection and make sure it is up. Returns (connection, its lock)."""
+        self._ensure_locks()
+        index = self._next % self.size
+        self._next += 1
+        conn, lock = self._connections[index], self._conn_locks[index]
+        # The lock only serializes (re)connecting and health checks, never requests
+        async with lock:
+            if not conn.alive:
+                await conn.connect()
+            elif time.monotonic() - conn.last_used > self.health_check_interval:
+                if not await conn.ping(self.ping_timeout):
+                    logger.info("Reconnecting stale MCP session")
+                    await conn.connect()
+        return conn, lock
+
+    @contextlib.asynccontextmanager
+    async def session(self):
+        """A connected ClientSession for the block; other callers may be using it concurrently."""
+        conn, lock = await self._acquire()
+        session = conn.session
+        try:
+            yield session
+        except TRANSPORT_ERRORS:
+            # Other callers share this connection, so only drop it if it is really gone
+            # (and nobody has replaced it already); the next caller reconnects it
+            async with lock:
+                if conn.session is session and not await conn.ping(self.ping_timeout):
+                    await conn.close()
+            raise
+        finally:
+            conn.last_used = time.monotonic()
+
+    async def list_tools(self, session: ClientSession = None) -> list:
+        """Return the server's tools, cached for tools_ttl seconds."""
+        self._ensure_locks()
+        async with self._tools_lock:
+            if self._tools is None or time.monotonic() - self._tools_fetched_at > self.tools_ttl:
+                if session is None:
+                    async with self.session() as pooled:
+                        result = await pooled.list_tools()
+                else:
+                    result = await session.list_tools()
+                self._tools = result.tools
+                self._tools_fetched_at = time.monotonic()
+            return self._tools
+
+    async def close(self):
+        for conn in self._connections:
+            await conn.close()
@@ -0,0 +1,184 @@
+import os
+import time
+import logging
+
+from mcp.shared.exceptions import McpError
+
+try:
+    from prompts import build_enhanced_system_prompt
+    from llm import stream_chat_step
+    from tool_calls import run_tool_calls
+    from artifacts import artifact_ref, fetch_artifact
+    from mcp_pool import TRANSPORT_ERRORS
+except ImportError:
+    # Imported as client_streamlit.orchestrator (e.g. by the Slack bot)
+    from client_streamlit.prompts import build_enhanced_system_prompt
+    from client_streamlit.llm import stream_chat_step
+    from client_streamlit.tool_calls import run_tool_calls
+    from client_streamlit.artifacts import artifact_ref, fetch_artifact
+    from client_streamlit.mcp_pool import TRANSPORT_ERRORS
+
+logger = logging.getLogger(__name__)
+
+
+class ChatSink:
+    """
+    Receives the output of a chat turn as it happens. Frontends subclass it and
+    override only what they render; every hook is async and optional.
+    """
+
+    async def on_text(self, delta: str):
+        """A piece of the assistant's reply."""
+
+    async def on_tool_start(self, call: dict):
+        """A tool call is about to run (calls of the same turn start together)."""
+
+    async def on_tool_progress(self, call: dict, message: str):
+        """A progress message from a running tool, e.g. a streamed document preview."""
+
+    async def on_artifact(self, call: dict, filename: str, content: bytes):
+        """A tool produced a document, already downloaded from the server's artifact store."""
+
+    async def on_tool_result(self, call: dict, content: str) -> str:
+        """A tool finished. Returns the text the model should see (defaults to content)."""
+        return content
+
+    async def on_finish(self, reply: str):
+        """The turn is complete; reply is the whole assistant message."""
+
+
+def to_openai_tools(tools) -> list:
+    """Convert MCP tool definitions to chat-completions function tools."""
+    return [{
+        "type": "function",
+        "function": {
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": tool.inputSchema
+        }
+    } for tool in tools]
+
+
+class ChatOrchestrator:
+    """
+    Runs chat turns for any frontend: uses a shared pooled MCP session, streams the model,
+    runs each turn's tool calls concurrently (with per-call timeouts) for up to
+    max_steps rounds, and reports everything to a ChatSink.
+    """
+
+    def __init__(self, pool, client, deployment_name: str, max_steps: int = 5, tool_timeout: float = 180):
+        self.pool = pool
+        self.client = client
+        self.deployment_name = deployment_name
+        self.max_steps = max_steps
+        self.tool_timeout = tool_timeout
+
+    @classmethod
+    def from_env(cls, pool, client, **overrides):
+        settings = dict(
+            deployment_name=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o"),
+            max_steps=int(os.getenv("AGENT_MAX_STEPS", "5")),
+            tool_timeout=float(os.getenv("MCP_TOOL_TIMEOUT", "180")),
+        )
+        settings.update(overrides)
+        return cls(pool, client, **settings)
+
+    async def run(self, history: list, resume_text: str, sink: ChatSink = None) -> dict:
+        """
+        Run one turn for history (user/assistant messages, newest last).
+        Returns {"reply", "tool_outputs": [{"name", "content", "artifact"?}], "metrics"};
+        "artifact" is {"filename", "mime_type", "content": bytes} for tools that generated a document.
+        """
+        sink = sink or ChatSink()
+        metrics = {"steps": 0, "tool_calls": 0, "llm_seconds": 0.0, "tool_seconds": 0.0}
+        started = time.perf_counter()
+        reply = []
+        tool_outputs = []
+
+        async def on_text(delta):
+            reply.append(delta)
+            await sink.on_text(delta)
+
+        async with self.pool.session() as session:
+            openai_tools = to_openai_tools(await self.pool.list_tools(session))
+            system_prompt = build_enhanced_system_prompt(resume_text, openai_tools)
+            messages = [{"role": "system", "content": system_prompt}] + list(history)
+
+            # Agent loop: keep calling tools until the model answers or the step budget runs out
+            for step in range(self.max_steps):
+                if reply:
+                    await on_text("\n\n")
+                metrics["steps"] += 1
+                llm_started = time.perf_counter()
+                content, tool_calls = await stream_chat_step(
+                    self.client,
+                    on_text=on_text,
+                    model=self.deployment_name,
+                    messages=messages,
+                    tools=openai_tools,
+                    tool_choice="auto",
+                )
+                metrics["llm_seconds"] += time.perf_counter() - llm_started
+                if not tool_calls:
+                    break
+
+                messages.append({"role": "assistant", "content": content or None, "tool_calls": tool_calls})
+                for call in tool_calls:
+                    await sink.on_tool_start(call)
+
+                # Independent calls from the same turn run concurrently
+                tools_started = time.perf_counter()
+                results = await run_tool_calls(
+                    session, tool_calls, timeout=self.tool_timeout, on_progress=sink.on_tool_progress
+                )
+                metrics["tool_seconds"] += time.perf_counter() - tools_started
+                metrics["tool_calls"] += len(tool_calls)
+
+                for call, result in zip(tool_calls, results):
+                    name = call["function"]["name"]
+                    output = {"name": name, "content": result}
+                    ref = artifact_ref(result)
+                    if ref is not None:
+                        output["artifact"] = await self._download(session, call, ref, sink)
+                    tool_outputs.append(output)
+                    messages.append({
+                        "tool_call_id": call["id"],
+                        "role": "tool",
+                        "name": name,
+                        "content": await sink.on_tool_result(call, result),
+                    })
+            else:
+                # Out of steps: answer with what the tools returned so far
+                llm_started = time.perf_counter()
+                await stream_chat_step(self.client, on_text=on_text, model=self.deployment_name, messages=messages)
+                metrics["llm_seconds"] += time.perf_counter() - llm_started
+
+        reply_text = "".join(reply).strip()
+        await sink.on_finish(reply_text)
+
+        metrics["total_seconds"] = time.perf_counter() - started
+        limiter = getattr(self.client, "rate_limiter", None)
+        if limiter is not None:
+            metrics["rate_limiter"] = limiter.stats()
+        logger.info(
+            f"Chat turn: {metrics['steps']} steps, {metrics['tool_calls']} tool calls, "
+            f"llm {metrics['llm_seconds']:.2f}s, tools {metrics['tool_seconds']:.2f}s, "
+            f"total {metrics['total_seconds']:.2f}s"
+        )
+        return {"reply": reply_text, "tool_outputs": tool_outputs, "metrics": metrics}
+
+    async def _download(self, session, call: dict, ref: dict, sink: ChatSink):
+        """Fetch a tool's document by reference; returns {"filename", "content"} or None on failure."""
+        try:
+            content = await fetch_artifact(session, ref)
+        except McpError as e:
+            # e.g. the artifact expired; the session itself is fine
+            logger.error(f"Could not fetch artifact {ref['artifact_id']}: {e}")
+            return None
+        except TRANSPORT_ERRORS:
+            raise
+        except Exception as e:
+            logger.error(f"Could not fetch artifact {ref['artifact_id']}: {e}")
+            return None
+        await sink.on_artifact(call, ref["filename"], content)
+        return {"filename": ref["filename"], "mime_type": ref.get("mime_type"), "content": content}
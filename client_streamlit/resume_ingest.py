@@ -0,0 +1,163 @@
+import io
+import os
+import re
+import asyncio
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Upload extension (or Slack filetype) -> parser
+FORMATS = {
+    "txt": "text", "md": "text", "text": "text", "markdown": "text",
+    "pdf": "pdf",
+    "docx": "docx", "doc": "docx",
+}
+
+# Common resume section titles; short all-caps lines are treated as headings too
+SECTION_TITLES = {
+    "summary", "professional summary", "profile", "objective", "experience", "work experience",
+    "professional experience", "employment", "education", "skills", "technical skills",
+    "projects", "certifications", "awards", "publications", "volunteer", "languages", "interests",
+}
+
+
+def _extract_text(data: bytes, parser: str) -> tuple:
+    """Return (raw text, page count) for data. Module-level so it can run in a worker process."""
+    if parser == "text":
+        return data.decode("utf-8-sig", errors="replace"), 1
+    if parser == "pdf":
+        import pypdf
+        reader = pypdf.PdfReader(io.BytesIO(data))
+        return "\n".join(page.extract_text() or "" for page in reader.pages), len(reader.pages)
+    import docx
+    doc = docx.Document(io.BytesIO(data))
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs), 1
+
+
+def normalize_text(text: str) -> str:
+    """NFKC-fold (PDF ligatures, odd spaces), trim lines and collapse runs of blank lines."""
+    text = unicodedata.normalize("NFKC", text).replace("\x00", "")
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _is_heading(line: str) -> bool:
+    title = line.rstrip(":").strip()
+    if not title or len(title) > 40:
+        return False
+    return title.lower() in SECTION_TITLES or (title.isupper() and len(title.split()) <= 4)
+
+
+def split_sections(text: str) -> list:
+    """Split normalized resume text into [{"heading", "text"}]; text before the first heading is the header."""
+    sections = [{"heading": "", "lines": []}]
+    for line in text.splitlines():
+        if _is_heading(line):
+            sections.append({"heading": line.rstrip(":").strip(), "lines": []})
+        else:
+            sections[-1]["lines"].append(line)
+    return [
+        {"heading": section["heading"], "text": "\n".join(section["lines"]).strip()}
+        for section in sections
+        if section["heading"] or any(section["lines"])
+    ]
+
+
+class ResumeParser:
+    """
+    Turns uploaded resume files (txt/md, PDF, DOCX) into text plus a structured view, cached
+    by the SHA-256 of the bytes so re-renders and repeat uploads skip parsing. Parsing runs
+    off the event loop: in a thread, or in a process pool for PDFs of `process_threshold`
+    bytes or more.
+    """
+
+    def __init__(self, max_size: int = 64, process_threshold: int = 512 * 1024, workers: int = 2):
+        self.max_size = max_size
+        self.process_threshold = process_threshold
+        self.workers = workers
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_size=int(os.getenv("RESUME_CACHE_SIZE", "64")),
+            process_threshold=int(os.getenv("RESUME_PROCESS_THRESHOLD", str(512 * 1024))),
+            workers=int(os.getenv("RESUME_PARSE_WORKERS", "2")),
+        )
+
+    async def parse(self, data: bytes, filename: str, file_type: str = None) -> dict:
+        """
+        Parse an uploaded resume. file_type overrides the filename's extension (e.g. a Slack
+        filetype). Returns {"sha256", "filename", "format", "pages", "text", "sections"};
+        raises ValueError for unsupported formats or files without text.
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            parsed = self._cache.get(sha256)
+            if parsed is not None:
+                self._cache.move_to_end(sha256)
+        if parsed is not None:
+            logger.info(f"Resume {filename} served from cache ({sha256[:12]})")
+            return dict(parsed, filename=filename)
+
+        file_type = (file_type or filename.rsplit(".", 1)[-1]).lower()
+        parser = FORMATS.get(file_type)
+        if parser is None:
+            raise ValueError(f"Unsupported resume format {file_type!r}; upload a PDF, DOCX, TXT or MD file.")
+
+        loop = asyncio.get_running_loop()
+        if parser == "pdf" and len(data) >= self.process_threshold:
+            raw, pages = await loop.run_in_executor(self._get_executor(), _extract_text, data, parser)
+        else:
+            raw, pages = await asyncio.to_thread(_extract_text, data, parser)
+
+        text = normalize_text(raw)
+        if not text:
+            hint = " Scanned PDFs need to be converted to text first." if parser == "pdf" else ""
+            raise ValueError(f"No text found in {filename}.{hint}")
+
+        parsed = {
+            "sha256": sha256,
+            "filename": filename,
+            "format": file_type,
+            "pages": pages,
+            "text": text,
+            "sections": split_sections(text),
+        }
+        with self._lock:
+            self._cache[sha256] = parsed
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        logger.info(f"Parsed resume {filename}: {len(data)} bytes, {pages} pages, {len(text)} chars")
+        return dict(parsed)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_resume_parser() -> ResumeParser:
+    """The process-wide parser, so its cache is shared by every session."""
+    global _parser
+    with _parser_lock:
+        if _parser is None:
+            _parser = ResumeParser.from_env()
+        return _parser
@@ -0,0 +1,57 @@
+import os
+import json
+import time
+import asyncio
+import logging
+
+try:
+    from mcp_pool import TRANSPORT_ERRORS
+except ImportError:
+    # Imported as client_streamlit.tool_calls (e.g. by the Slack bot)
+    from client_streamlit.mcp_pool import TRANSPORT_ERRORS
+
+logger = logging.getLogger(__name__)
+
+
+def tool_result_text(result) -> str:
+    """Join every text part of a CallToolResult (not just the first)."""
+    if hasattr(result, "content") and isinstance(result.content, list):
+        return "\n".join(item.text if hasattr(item, "text") else str(item) for item in result.content)
+    return str(result)
+
+
+async def call_tool(session, call: dict, timeout: float = None, on_progress=None) -> str:
+    """
+    Run one chat-format tool call on an MCP session and return its text. Timeouts and
+    tool failures are returned as error text for the model; transport errors propagate
+    so the pool can drop the connection.
+    """
+    name = call["function"]["name"]
+    timeout = timeout or float(os.getenv("MCP_TOOL_TIMEOUT", "180"))
+
+    async def progress_callback(progress, total, message):
+        if message and on_progress is not None:
+            await on_progress(call, message)
+
+    start = time.perf_counter()
+    try:
+        args = json.loads(call["function"]["arguments"] or "{}")
+        result = await asyncio.wait_for(
+            session.call_tool(name, arguments=args, progress_callback=progress_callback), timeout
+        )
+        return tool_result_text(result)
+    except TRANSPORT_ERRORS:
+        raise
+    except asyncio.TimeoutError:
+        logger.warning(f"Tool {name} timed out after {timeout:.0f}s")
+        return f"Error: {name} timed out after {timeout:.0f} seconds."
+    except Exception as e:
+        logger.error(f"Tool {name} failed: {e}")
+        return f"Error: {name} failed: {e}"
+    finally:
+        logger.info(f"Tool {name} finished in {time.perf_counter() - start:.2f}s")
+
+
+async def run_tool_calls(session, tool_calls: list, timeout: float = None, on_progress=None) -> list:
+    """Run all tool calls from one model turn concurrently; returns their texts in order."""
+    return await asyncio.gather(*(call_tool(session, call, timeout, on_progress) for call in tool_calls))
@@ -1,7 +1,13 @@
-from mcp.server.fastmcp import FastMCP
-from tools.jobs import search_jobs_tool
+import os
+from mcp.server.fastmcp import FastMCP, Context
+from tools.jobs import search_jobs_tool, search_saved_jobs_tool, get_job_tool
 from tools.resume import tailor_resume_tool, generate_cover_letter_tool
-from tools.web_scraper import scrape_job_description_tool
+from tools.web_scraper import scrape_job_description_tool, scrape_job_descriptions_tool
+from tools.batch import apply_to_jobs_tool
+from tools.concurrency import tool_limit
+from tools.artifacts import get_artifact_store
+from starlette.requests import Request
+from starlette.responses import Response
 import logging
 
 # Configure logging
@@ -11,31 +17,139 @@ logging.basicConfig(level=logging.INFO)
 mcp = FastMCP("Job Assistant", host="0.0.0.0", port=8080)
 
 @mcp.tool()
-def search_jobs(search_term: str, location: str = "", results_wanted: int = 10) -> list:
+@tool_limit("search_jobs", default=4)
+async def search_jobs(
+    search_term: str,
+    location: str = "",
+    results_wanted: int = 10,
+    compact: bool = True,
+    description_chars: int = 300,
+) -> dict:
     """
     Search for jobs on various platforms (Indeed, LinkedIn, etc.).
-    Returns a list of job dictionaries with title, company, location, job_url, and description.
+    Returns {"jobs": [...], "sites": {...}}: 'jobs' is a list of job dictionaries with id,
+    title, company, location, site, job_url, salary and a short description snippet;
+    'sites' reports whether each site succeeded ("ok"), timed out ("timeout"), or failed ("error: ...").
     
-    IMPORTANT: The result ALREADY contains the job description in the 'description' field.
+    IMPORTANT: 'description' is only a snippet. Call get_job with the job's 'id' to get the
+    full description before tailoring a resume or writing a cover letter.
+    Set compact=False only if you need every raw field for every job.
     """
-    return search_jobs_tool(search_term, location, results_wanted)
+    return await search_jobs_tool(search_term, location, results_wanted, compact, description_chars)
 
 @mcp.tool()
-def tailor_resume(resume_text: str, job_description: str) -> str:
+async def get_job(job_id: str) -> dict:
+    """
+    Get the full details of a job found by search_jobs or search_saved_jobs, including the
+    complete description. Pass the job's 'id'.
+    """
+    return await get_job_tool(job_id)
+
+@mcp.tool()
+async def search_saved_jobs(query: str, location: str = "", limit: int = 10) -> list:
+    """
+    Instantly search the descriptions of all previously found jobs (no new scraping).
+    Supports keywords and "quoted phrases", e.g. 'python "machine learning"'; all terms must match.
+    Optionally filter by location text. Returns the best matches first with id, title, company,
+    location, site, job_url and a highlighted description snippet.
+    Use this to explore similar roles before running a fresh search_jobs.
+    """
+    return await search_saved_jobs_tool(query, location, limit)
+
+@mcp.tool()
+@tool_limit("scrape_job_description", default=8)
+async def scrape_job_description(url: str) -> str:
+    """
+    Fetch a job posting URL (e.g. one the user pasted) and return the page's text content,
+    for use as the job description.
+    """
+    return await scrape_job_description_tool(url)
+
+@mcp.tool()
+@tool_limit("scrape_job_descriptions", default=4)
+async def scrape_job_descriptions(urls: list[str], ctx: Context) -> list:
+    """
+    Fetch several job posting URLs at once (e.g. to compare postings from a search) and return
+    [{"url", "text"} or {"url", "error"}] in the same order. Prefer this over calling
+    scrape_job_description repeatedly.
+    """
+    async def report(result, done, total):
+        status = "ok" if "text" in result else f"error: {result['error']}"
+        await ctx.report_progress(done, total, message=f"{result['url']}: {status}")
+
+    return await scrape_job_descriptions_tool(urls, on_result=report)
+
+def _preview_reporter(ctx: Context):
+    """Stream a document's partial preview to the client as progress notifications."""
+    async def report(preview: str):
+        # progress must increase; the preview only ever grows
+        await ctx.report_progress(len(preview), message=preview)
+    return report
+
+@mcp.tool()
+@tool_limit("tailor_resume", default=8)
+async def tailor_resume(resume_text: str, job_description: str, ctx: Context) -> str:
     """
     Tailor a resume to match a specific job description.
     Returns the tailored resume in Markdown format.
     """
-    return tailor_resume_tool(resume_text, job_description)
+    return await tailor_resume_tool(resume_text, job_description, on_preview=_preview_reporter(ctx))
 
 @mcp.tool()
-def generate_cover_letter(resume_text: str, job_description: str) -> str:
+@tool_limit("generate_cover_letter", default=8)
+async def generate_cover_letter(resume_text: str, job_description: str, ctx: Context) -> str:
     """
     Generate a cover letter based on a resume and job description.
     Returns the cover letter in Markdown format.
     """
-    return generate_cover_letter_tool(resume_text, job_description)
+    return await generate_cover_letter_tool(resume_text, job_description, on_preview=_preview_reporter(ctx))
+
+@mcp.tool()
+@tool_limit("apply_to_jobs", default=2)
+async def apply_to_jobs(
+    resume_text: str,
+    jobs: list[str],
+    ctx: Context,
+    documents: list[str] | None = None,
+) -> dict:
+    """
+    Tailor the resume and/or write a cover letter for several jobs in one call (e.g. "apply to
+    these five jobs"). Each entry in 'jobs' is a job id from search_jobs/search_saved_jobs, a
+    posting URL, or a full job description. 'documents' selects "resume" and/or "cover_letter"
+    (default both).
+    Returns per-job status and one ZIP with every document. Prefer this over calling
+    tailor_resume/generate_cover_letter repeatedly.
+    """
+    async def report(done, total, message):
+        await ctx.report_progress(done, total, message=message)
+
+    return await apply_to_jobs_tool(resume_text, jobs, documents, on_progress=report)
+
+@mcp.resource("artifact://{artifact_id}", mime_type="application/octet-stream")
+def read_artifact(artifact_id: str) -> bytes:
+    """
+    A generated document (resume or cover letter) by the id returned from the tool that
+    created it. Artifacts are short-lived; over SSE prefer GET /artifacts/{artifact_id}.
+    """
+    artifact = get_artifact_store().get(artifact_id)
+    if artifact is None:
+        raise ValueError(f"Unknown or expired artifact: {artifact_id}")
+    return artifact[0]
+
+@mcp.custom_route("/artifacts/{artifact_id}", methods=["GET"])
+async def download_artifact(request: Request) -> Response:
+    # Raw bytes over HTTP, so SSE clients skip the base64 encoding of resources/read
+    artifact = get_artifact_store().get(request.path_params["artifact_id"])
+    if artifact is None:
+        return Response("Unknown or expired artifact", status_code=404)
+    content, filename, mime_type = artifact
+    return Response(
+        content,
+        media_type=mime_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 if __name__ == "__main__":
-    mcp.run(transport='sse')
+    # Clients spawning the server as a subprocess set MCP_TRANSPORT=stdio
+    mcp.run(transport=os.getenv("MCP_TRANSPORT", "sse"))
@@ -0,0 +1,73 @@
+import os
+import time
+import secrets
+import logging
+import threading
+from collections import OrderedDict
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class ArtifactStore:
+    """
+    In-memory store for generated files, handed out by short-lived unguessable IDs so tool
+    results carry a reference instead of the (base64-encoded) bytes. Entries expire after
+    `ttl` seconds; the oldest are evicted once the store holds more than `max_bytes`.
+    """
+
+    def __init__(self, ttl: float = 900.0, max_bytes: int = 100 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def put(self, content: bytes, filename: str, mime_type: str = DOCX_MIME) -> dict:
+        """Store content and return its reference: {"artifact_id", "uri", "path", "filename", "mime_type", "size"}."""
+        artifact_id = secrets.token_urlsafe(16)
+        with self._lock:
+            self._purge()
+            self._data[artifact_id] = (time.monotonic() + self.ttl, content, filename, mime_type)
+            self._size += len(content)
+            while self._size > self.max_bytes and len(self._data) > 1:
+                _, (_, evicted, _, _) = self._data.popitem(last=False)
+                self._size -= len(evicted)
+        return {
+            "artifact_id": artifact_id,
+            "uri": f"artifact://{artifact_id}",
+            "path": f"/artifacts/{artifact_id}",
+            "filename": filename,
+            "mime_type": mime_type,
+            "size": len(content),
+        }
+
+    def get(self, artifact_id: str):
+        """Return (content, filename, mime_type), or None if unknown or expired."""
+        with self._lock:
+            self._purge()
+            entry = self._data.get(artifact_id)
+            return entry[1:] if entry else None
+
+    def _purge(self):
+        now = time.monotonic()
+        for artifact_id in [key for key, entry in self._data.items() if entry[0] < now]:
+            _, content, _, _ = self._data.pop(artifact_id)
+            self._size -= len(content)
+
+
+_artifact_store = None
+_artifact_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    global _artifact_store
+    with _artifact_store_lock:
+        if _artifact_store is None:
+            _artifact_store = ArtifactStore(
+                ttl=float(os.getenv("ARTIFACT_TTL", "900")),
+                max_bytes=int(os.getenv("ARTIFACT_MAX_BYTES", str(100 * 1024 * 1024))),
+            )
+        return _artifact_store
@@ -0,0 +1,78 @@
+import os
+import logging
+import threading
+import httpx
+from openai import AsyncAzureOpenAI
+from tools.rate_limit import RateLimiter, rate_limited
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# What each model call is for. "default" writes documents; "metadata" is short, constrained
+# extraction that can run on a smaller, cheaper deployment.
+ROLES = ("default", "metadata")
+
+DEFAULT_DEPLOYMENT = "gpt-4o"
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _setting(role: str, name: str, default: str = None):
+    """
+    Read an AZURE_OPENAI_* setting for role. A non-default role may override any setting with
+    AZURE_OPENAI_<ROLE>_* (e.g. AZURE_OPENAI_METADATA_DEPLOYMENT_NAME); otherwise the shared value applies.
+    """
+    if role != "default":
+        override = os.getenv(name.replace("AZURE_OPENAI_", f"AZURE_OPENAI_{role.upper()}_", 1))
+        if override:
+            return override
+    return os.getenv(name, default)
+
+
+def get_deployment(role: str = "default") -> str:
+    """The deployment name model calls for role should use."""
+    return _setting(role, "AZURE_OPENAI_DEPLOYMENT_NAME") or DEFAULT_DEPLOYMENT
+
+
+def _create_client(role: str) -> AsyncAzureOpenAI:
+    def setting(name, default=None):
+        return _setting(role, name, default)
+
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=int(setting("AZURE_OPENAI_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(setting("AZURE_OPENAI_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(setting("AZURE_OPENAI_KEEPALIVE_EXPIRY", "60")),
+        ),
+        timeout=httpx.Timeout(
+            float(setting("AZURE_OPENAI_TIMEOUT", "120")),
+            connect=float(setting("AZURE_OPENAI_CONNECT_TIMEOUT", "10")),
+        ),
+    )
+    client = AsyncAzureOpenAI(
+        api_key=setting("AZURE_OPENAI_API_KEY"),
+        api_version=setting("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
+        azure_endpoint=setting("AZURE_OPENAI_ENDPOINT"),
+        http_client=http_client,
+    )
+    # Azure quotas are per deployment, so each deployment gets its own limiter
+    return rate_limited(client, RateLimiter.from_env(setting))
+
+
+def get_azure_client(role: str = "default") -> AsyncAzureOpenAI:
+    """
+    Return the process-wide client for role's deployment, creating it (and its connection
+    pool) on first use. Roles that resolve to the same endpoint and deployment share a client.
+    """
+    if role not in ROLES:
+        raise ValueError(f"Unknown Azure OpenAI role {role!r}; expected one of {list(ROLES)}")
+    key = (_setting(role, "AZURE_OPENAI_ENDPOINT"), _setting(role, "AZURE_OPENAI_API_KEY"), get_deployment(role))
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = _create_client(role)
+                logger.info(f"Created Azure OpenAI client for deployment {key[2]} (role={role})")
+    return client
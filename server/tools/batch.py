@@ -0,0 +1,134 @@
+import io
+import os
+import time
+import asyncio
+import logging
+import zipfile
+from datetime import datetime
+from tools.concurrency import run_blocking, run_io
+from tools.job_index import get_job_index
+from tools.web_scraper import _scrape
+from tools.artifacts import get_artifact_store
+from tools.resume import tailor_resume_document, generate_cover_letter_document, sanitize_filename
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DOCUMENT_KINDS = ("resume", "cover_letter")
+
+
+def _job_text(job: dict) -> str:
+    """A stored posting as a job description: a short header plus the full description."""
+    header = [
+        ("Title", job.get("title")),
+        ("Company", job.get("company")),
+        ("Location", job.get("location")),
+    ]
+    lines = [f"{label}: {value}" for label, value in header if value]
+    return "\n".join(lines) + "\n\n" + (job.get("description") or "")
+
+
+async def _resolve_job(job: str) -> tuple:
+    """
+    Turn one batch entry into (label, job_description): a job id from search_jobs /
+    search_saved_jobs, a posting URL, or the job description text itself (several words).
+    Raises ValueError for an unknown id or a page with no text, so no documents are
+    generated from them.
+    """
+    job = job.strip()
+    if job.startswith(("http://", "https://")):
+        text = await _scrape(job)
+        if not text.strip():
+            raise ValueError("no job description found at this URL")
+        return job, text
+
+    # Ids are short single tokens; anything else is description text
+    if len(job) <= 64 and len(job.split()) == 1:
+        stored = await run_io(get_job_index().get_job, job)
+        if stored is None:
+            raise ValueError(f"unknown job id {job!r}; use an id from search_jobs or search_saved_jobs")
+        label = " - ".join(part for part in (stored.get("title"), stored.get("company")) if part)
+        return label or job, _job_text(stored)
+
+    first_line = job.splitlines()[0]
+    return first_line[:80], job
+
+
+def _build_zip(files: list) -> bytes:
+    """Package (name, content) pairs. DOCX is already deflated, so entries are stored as-is."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, content in files:
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+async def apply_to_jobs_tool(resume_text: str, jobs: list, documents: list = None, on_progress=None) -> dict:
+    """
+    Tailors a resume and/or writes a cover letter for each job, running up to
+    BATCH_APPLY_CONCURRENCY jobs at once (at most BATCH_APPLY_MAX_JOBS per request).
+
+    Args:
+        resume_text: The candidate's resume.
+        jobs: Job ids, posting URLs or job description texts (unknown ids fail that job).
+        documents: Which documents to generate per job ("resume", "cover_letter"); both by default.
+        on_progress: Optional async callback(done, total, message) called as each job finishes.
+
+    Returns:
+        {"jobs": [{"job", "status", "files", "error"?}]} plus, if anything was generated, the
+        artifact reference ("artifact_id", "uri", ...) of one ZIP holding every document.
+    """
+    documents = [kind for kind in (documents or DOCUMENT_KINDS) if kind in DOCUMENT_KINDS]
+    if not documents:
+        return {"error": f"documents must include at least one of {list(DOCUMENT_KINDS)}"}
+
+    max_jobs = int(os.getenv("BATCH_APPLY_MAX_JOBS", "10"))
+    jobs = list(dict.fromkeys(job for job in jobs if job and job.strip()))
+    if len(jobs) > max_jobs:
+        return {"error": f"At most {max_jobs} jobs per request; got {len(jobs)}."}
+
+    limit = asyncio.Semaphore(int(os.getenv("BATCH_APPLY_CONCURRENCY", "4")))
+    done = 0
+
+    async def apply_one(position: int, job: str) -> dict:
+        nonlocal done
+        start = time.perf_counter()
+        result = {"job": job[:80], "status": "ok", "files": []}
+        generated = []
+        try:
+            async with limit:
+                label, job_description = await _resolve_job(job)
+                result["job"] = label
+                # Sequential within a job so the cover letter reuses the resume's cached job analysis
+                if "resume" in documents:
+                    generated.append(await tailor_resume_document(resume_text, job_description))
+                if "cover_letter" in documents:
+                    generated.append(await generate_cover_letter_document(resume_text, job_description))
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e).splitlines()[0] if str(e) else type(e).__name__
+            logger.error(f"Batch apply failed for {result['job']}: {e}")
+
+        # Folder per job keeps identical filenames (same candidate, same day) apart
+        folder = f"{position + 1:02d}_{sanitize_filename(result['job'])[:50] or 'job'}"
+        for document in generated:
+            result["files"].append({"name": f"{folder}/{document['filename']}", "content": document["content"]})
+
+        done += 1
+        logger.info(f"Batch apply {done}/{len(jobs)}: {result['job']} {result['status']} in {time.perf_counter() - start:.2f}s")
+        if on_progress is not None:
+            await on_progress(done, len(jobs), f"{result['job']}: {result.get('error', 'done')}")
+        return result
+
+    logger.info(f"Batch apply: {len(jobs)} jobs, documents={documents}")
+    results = await asyncio.gather(*(apply_one(position, job) for position, job in enumerate(jobs)))
+
+    files = [(file["name"], file["content"]) for result in results for file in result["files"]]
+    for result in results:
+        result["files"] = [file["name"] for file in result["files"]]
+    if not files:
+        return {"jobs": results}
+
+    content = await run_blocking(_build_zip, files)
+    filename = f"Applications_{datetime.now().strftime('%Y-%m-%d')}.zip"
+    return {"jobs": results, **get_artifact_store().put(content, filename, mime_type="application/zip")}
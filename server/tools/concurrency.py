@@ -0,0 +1,88 @@
+import os
+import asyncio
+import logging
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_executor = None
+_scrape_executor = None
+_tool_semaphores = {}
+
+
+def get_executor() -> Executor:
+    """
+    Return the shared executor for CPU-bound work (HTML extraction, DOCX rendering, zipping).
+    MCP_EXECUTOR selects "thread" (default) or "process"; MCP_EXECUTOR_WORKERS sets its size.
+    In process mode functions and arguments are pickled, so only pass module-level
+    functions and plain data; use run_io for anything holding locks or connections.
+    """
+    global _executor
+    if _executor is None:
+        kind = os.getenv("MCP_EXECUTOR", "thread").lower()
+        workers = int(os.getenv("MCP_EXECUTOR_WORKERS", "8"))
+        if kind == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-worker")
+        logger.info(f"Started {kind} executor with {workers} workers")
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking function on the shared executor without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def run_io(func, *args, **kwargs):
+    """
+    Run blocking I/O (SQLite caches and indexes) on a thread, whatever MCP_EXECUTOR is:
+    bound methods of objects holding a lock or connection cannot be sent to a process.
+    """
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+def get_scrape_executor() -> ThreadPoolExecutor:
+    """
+    Threads for job-board scrapes (JOB_SEARCH_WORKERS), kept apart from the shared executor:
+    a timed-out scrape keeps running in its thread, and should only use up scrape capacity.
+    """
+    global _scrape_executor
+    if _scrape_executor is None:
+        # Default: MCP_TOOL_LIMIT_SEARCH_JOBS (4) searches x 3 sites, so scrapes rarely queue
+        workers = int(os.getenv("JOB_SEARCH_WORKERS", "12"))
+        _scrape_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-scrape")
+        logger.info(f"Started job scrape executor with {workers} workers")
+    return _scrape_executor
+
+
+async def run_scrape(func, *args, **kwargs):
+    """Run a blocking scrape on the scrape executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_scrape_executor(), functools.partial(func, *args, **kwargs))
+
+
+def tool_limit(name: str, default: int):
+    """
+    Cap concurrent invocations of an async tool. The limit is read from
+    MCP_TOOL_LIMIT_<NAME> (e.g. MCP_TOOL_LIMIT_SEARCH_JOBS) and defaults to `default`.
+    Calls over the limit wait for a free slot.
+    """
+    limit = int(os.getenv(f"MCP_TOOL_LIMIT_{name.upper()}", str(default)))
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            semaphore = _tool_semaphores.get(name)
+            if semaphore is None:
+                semaphore = _tool_semaphores[name] = asyncio.Semaphore(limit)
+            if semaphore.locked():
+                logger.info(f"{name}: {limit} calls in flight, waiting for a slot")
+            async with semaphore:
+                return await func(*args, **kwargs)
+        return wrapper
+
+    return decorator
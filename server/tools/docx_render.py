@@ -0,0 +1,233 @@
+import io
+import logging
+import threading
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from docx.shared import Pt, Inches, RGBColor
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Named paragraph styles per document kind. Formatting lives in the template's
+# styles.xml, so rendering only adds paragraphs and sets a style name.
+RESUME_STYLES = {
+    "Resume Name": dict(size=16, bold=True, align=WD_ALIGN_PARAGRAPH.CENTER, space_after=2),
+    "Resume Contact": dict(size=9, align=WD_ALIGN_PARAGRAPH.CENTER, space_after=6),
+    "Resume Heading": dict(size=11, bold=True, color=RGBColor(0, 0, 0), space_before=6, space_after=4),
+    "Resume Summary": dict(size=10, space_after=6),
+    "Resume Text": dict(size=10),
+    "Resume Item": dict(size=10, bold=True, space_after=1),
+    "Resume Item Detail": dict(size=9, space_after=4),
+    "Resume Job Detail": dict(size=9, italic=True, space_after=2),
+    "Resume Bullet": dict(size=10, space_after=1, line_spacing=1.0, base="List Bullet"),
+    "Resume Spacer": dict(space_after=4),
+}
+
+LETTER_STYLES = {
+    "Letter Name": dict(size=12, bold=True, space_after=0),
+    "Letter Line": dict(space_after=0),
+    "Letter Block End": dict(space_after=12),
+    "Letter Body": dict(space_after=12, line_spacing=1.15),
+}
+
+TEMPLATES = {
+    "resume": dict(margins=(0.4, 0.4, 0.5, 0.5), styles=RESUME_STYLES),
+    "cover_letter": dict(margins=(1, 1, 1, 1), styles=LETTER_STYLES),
+}
+
+# Package parts python-docx's default template ships that these documents never use
+UNUSED_RELS = ("stylesWithEffects", "customXml", "thumbnail")
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def _add_style(doc: Document, name: str, spec: dict):
+    style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+    style.base_style = doc.styles[spec.get("base", "Normal")]
+    style.quick_style = True
+    font = style.font
+    if "size" in spec:
+        font.size = Pt(spec["size"])
+    if spec.get("bold"):
+        font.bold = True
+    if spec.get("italic"):
+        font.italic = True
+    if "color" in spec:
+        font.color.rgb = spec["color"]
+    paragraph_format = style.paragraph_format
+    if "align" in spec:
+        paragraph_format.alignment = spec["align"]
+    if "space_before" in spec:
+        paragraph_format.space_before = Pt(spec["space_before"])
+    if "space_after" in spec:
+        paragraph_format.space_after = Pt(spec["space_after"])
+    if "line_spacing" in spec:
+        paragraph_format.line_spacing = spec["line_spacing"]
+
+
+def _prune_styles(doc: Document, keep: set):
+    """Drop every style (and the latent style list) not needed by `keep`; the default styles.xml is ~440 KB."""
+    styles = doc.styles.element
+    by_id = {style.get(qn("w:styleId")): style for style in styles.findall(qn("w:style"))}
+    needed = {style_id for style_id, style in by_id.items()
+              if style.get(qn("w:default")) == "1" or style.name_val in keep}
+
+    # Follow basedOn/next/link references so kept styles stay intact
+    pending = list(needed)
+    while pending:
+        style = by_id.get(pending.pop())
+        for tag in ("w:basedOn", "w:next", "w:link"):
+            ref = style.find(qn(tag)) if style is not None else None
+            if ref is not None and ref.get(qn("w:val")) not in needed:
+                needed.add(ref.get(qn("w:val")))
+                pending.append(ref.get(qn("w:val")))
+
+    for style_id, style in by_id.items():
+        if style_id not in needed:
+            styles.remove(style)
+    latent = styles.find(qn("w:latentStyles"))
+    if latent is not None:
+        styles.remove(latent)
+
+
+def _drop_unused_parts(doc: Document):
+    for rels in (doc.part.rels, doc.part.package.rels):
+        for rId, rel in list(rels.items()):
+            if rel.reltype.rsplit("/", 1)[-1] in UNUSED_RELS:
+                rels.pop(rId)
+
+
+def _build_template(kind: str) -> bytes:
+    spec = TEMPLATES[kind]
+    doc = Document()
+
+    top, bottom, left, right = spec["margins"]
+    for section in doc.sections:
+        section.top_margin = Inches(top)
+        section.bottom_margin = Inches(bottom)
+        section.left_margin = Inches(left)
+        section.right_margin = Inches(right)
+
+    for name, style_spec in spec["styles"].items():
+        _add_style(doc, name, style_spec)
+
+    _prune_styles(doc, set(spec["styles"]) | {"Normal", "List Bullet"})
+    _drop_unused_parts(doc)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    logger.info(f"Built {kind} DOCX template ({len(buffer.getvalue())} bytes)")
+    return buffer.getvalue()
+
+
+class _Writer:
+    """Appends paragraphs with named styles, resolving style names to ids once per template."""
+
+    def __init__(self, doc: Document, style_ids: dict):
+        self.doc = doc
+        self.style_ids = style_ids
+
+    def add(self, text: str, style: str = None):
+        paragraph = self.doc.add_paragraph(text)
+        if style:
+            # Setting the id directly skips python-docx's per-call style lookup by name
+            paragraph._p.style = self.style_ids[style]
+        return paragraph
+
+
+def new_document(kind: str) -> _Writer:
+    """A fresh document from the preloaded, pre-styled template for kind (built once per process)."""
+    template = _templates.get(kind)
+    if template is None:
+        with _templates_lock:
+            template = _templates.get(kind)
+            if template is None:
+                content = _build_template(kind)
+                doc = Document(io.BytesIO(content))
+                style_ids = {name: doc.styles[name].style_id for name in TEMPLATES[kind]["styles"]}
+                template = _templates[kind] = (content, style_ids)
+    content, style_ids = template
+    return _Writer(Document(io.BytesIO(content)), style_ids)
+
+
+def to_bytes(doc: Document) -> bytes:
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def render_resume(data: dict) -> bytes:
+    """Render a resume (tailor_resume JSON) to DOCX bytes."""
+    writer = new_document("resume")
+    add = writer.add
+
+    add(data.get("name", ""), "Resume Name")
+
+    contact = data.get("contact", {})
+    contact_parts = [contact[key] for key in ("email", "phone", "location", "linkedin") if contact.get(key)]
+    if contact_parts:
+        add(" | ".join(contact_parts), "Resume Contact")
+
+    if data.get("summary"):
+        add("PROFESSIONAL SUMMARY", "Resume Heading")
+        add(data["summary"], "Resume Summary")
+
+    if data.get("education"):
+        add("EDUCATION", "Resume Heading")
+        for edu in data["education"]:
+            add(edu.get("degree", ""), "Resume Item")
+            add(f"{edu.get('school', '')} - {edu.get('location', '')} | {edu.get('graduation', '')}", "Resume Item Detail")
+
+    if data.get("experience"):
+        add("EXPERIENCE", "Resume Heading")
+        for i, exp in enumerate(data["experience"]):
+            add(f"{exp.get('title', '')} - {exp.get('company', '')}", "Resume Item")
+            add(f"{exp.get('location', '')} | {exp.get('dates', '')}", "Resume Job Detail")
+            for responsibility in exp.get("responsibilities") or []:
+                add(responsibility, "Resume Bullet")
+            if i < len(data["experience"]) - 1:
+                add("", "Resume Spacer")
+
+    if data.get("skills"):
+        add("SKILLS", "Resume Heading")
+        add(", ".join(data["skills"]), "Resume Text")
+
+    return to_bytes(writer.doc)
+
+
+def render_cover_letter(data: dict) -> bytes:
+    """Render a cover letter (generate_cover_letter JSON) to DOCX bytes."""
+    writer = new_document("cover_letter")
+    add = writer.add
+
+    add(data.get("name", ""), "Letter Name")
+
+    # Contact lines; the last one closes the block
+    contact = data.get("contact", {})
+    if contact.get("address"):
+        add(contact["address"], "Letter Line")
+    if contact.get("phone"):
+        add(contact["phone"], "Letter Line")
+    if contact.get("email"):
+        add(contact["email"], "Letter Block End")
+
+    if data.get("date"):
+        add(data["date"], "Letter Block End")
+
+    recipient = data.get("recipient", {})
+    if recipient:
+        for key in ["name", "title", "company", "address"]:
+            if recipient.get(key):
+                add(recipient[key], "Letter Line")
+        add("", "Letter Block End")
+
+    for paragraph in data.get("body_paragraphs") or []:
+        add(paragraph, "Letter Body")
+
+    add("Sincerely,", "Letter Block End")
+    add(data.get("name", ""))
+
+    return to_bytes(writer.doc)
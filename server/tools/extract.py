@@ -0,0 +1,251 @@
+import re
+import json
+import logging
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Limit length to avoid context window issues (approx 10k chars)
+MAX_CHARS = 10000
+
+# A match shorter than this is treated as a miss (e.g. an empty placeholder div)
+MIN_CONTENT_CHARS = 200
+
+# Never text content; stripped even when falling back to the whole page
+NON_TEXT_TAGS = ["script", "style", "noscript", "template", "svg", "iframe"]
+
+# Page chrome around the description. <form> is deliberately absent: ASP.NET WebForms
+# sites (common for ATS and career pages) wrap the whole body in one.
+BOILERPLATE_TAGS = NON_TEXT_TAGS + ["nav", "header", "footer", "aside", "button", "select"]
+
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "br", "tr", "table",
+    "h1", "h2", "h3", "h4", "h5", "h6", "dd", "dt", "pre", "blockquote",
+}
+
+# Job description containers per site, most specific first. Selectors are "#id", ".class[.class]" or "tag".
+SITE_SELECTORS = {
+    "indeed.": ["#jobDescriptionText"],
+    "linkedin.": [".show-more-less-html__markup", ".description__text", ".jobs-description__content"],
+    "ziprecruiter.": [".job_description", ".jobDescriptionSection"],
+    "greenhouse.io": [".job__description", "#content"],
+    "lever.co": [".section-wrapper.page-full-width", ".posting-page"],
+}
+
+GENERIC_SELECTORS = ["main", "article", "#content", ".job-description", ".description"]
+
+JSON_LD_RE = re.compile(
+    r"<script[^>]+type=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def available_parsers() -> list:
+    parsers = []
+    if LexborHTMLParser is not None:
+        parsers.append("selectolax")
+    if lxml is not None:
+        parsers.append("lxml")
+    parsers.append("html.parser")
+    return parsers
+
+
+def _parse_selector(selector: str):
+    """Split a selector into (tag, id, classes)."""
+    if selector.startswith("#"):
+        return None, selector[1:], []
+    if selector.startswith("."):
+        return None, None, selector[1:].split(".")
+    return selector, None, []
+
+
+def _normalize_text(text: str) -> str:
+    # Break into lines, strip each and drop blank lines
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[:cut if cut > max_chars // 2 else max_chars]
+
+
+# -----------------------------------------------------------------------------
+# Parser backends: each returns the text of the first selector that matches
+# with enough content (`strip` tags removed), or of the whole body.
+# -----------------------------------------------------------------------------
+def _select_selectolax(html: str, selectors: list, strip: list = BOILERPLATE_TAGS) -> str:
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(strip)
+    for selector in selectors:
+        node = tree.css_first(selector)
+        if node is not None:
+            text = node.text(separator="\n")
+            if len(text.strip()) >= MIN_CONTENT_CHARS:
+                return text
+    root = tree.body or tree.root
+    return root.text(separator="\n") if root is not None else ""
+
+
+def _lxml_xpath(selector: str) -> str:
+    tag, element_id, classes = _parse_selector(selector)
+    if element_id:
+        return f"//*[@id='{element_id}']"
+    if classes:
+        conditions = " and ".join(
+            f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')" for cls in classes
+        )
+        return f"//*[{conditions}]"
+    return f"//{tag}"
+
+
+def _lxml_text(element) -> str:
+    # text_content() joins blocks without separators; add line breaks after block elements
+    for child in element.iter():
+        if isinstance(child.tag, str) and child.tag in BLOCK_TAGS:
+            child.tail = "\n" + (child.tail or "")
+    return element.text_content()
+
+
+def _select_lxml(html: str, selectors: list, strip: list = BOILERPLATE_TAGS) -> str:
+    try:
+        root = lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return ""
+    for element in root.xpath("|".join(f"//{tag}" for tag in strip)):
+        element.drop_tree()
+    for selector in selectors:
+        matches = root.xpath(_lxml_xpath(selector))
+        if matches:
+            text = _lxml_text(matches[0])
+            if len(text.strip()) >= MIN_CONTENT_CHARS:
+                return text
+    body = root.find("body")
+    return _lxml_text(body if body is not None else root)
+
+
+def _select_bs4(html: str, selectors: list, strip: list = BOILERPLATE_TAGS) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(strip):
+        element.decompose()
+    for selector in selectors:
+        node = soup.select_one(selector)
+        if node is not None:
+            text = node.get_text(separator="\n")
+            if len(text.strip()) >= MIN_CONTENT_CHARS:
+                return text
+    root = soup.body or soup
+    return root.get_text(separator="\n")
+
+
+BACKENDS = {
+    "selectolax": _select_selectolax,
+    "lxml": _select_lxml,
+    "html.parser": _select_bs4,
+}
+
+
+# -----------------------------------------------------------------------------
+# JSON-LD JobPosting
+# -----------------------------------------------------------------------------
+def _find_job_posting(data):
+    if isinstance(data, list):
+        for item in data:
+            found = _find_job_posting(item)
+            if found:
+                return found
+    elif isinstance(data, dict):
+        types = data.get("@type")
+        if types == "JobPosting" or (isinstance(types, list) and "JobPosting" in types):
+            return data
+        if "@graph" in data:
+            return _find_job_posting(data["@graph"])
+    return None
+
+
+def _posting_location(posting: dict) -> str:
+    locations = posting.get("jobLocation") or []
+    if isinstance(locations, dict):
+        locations = [locations]
+    names = []
+    for location in locations:
+        address = location.get("address") if isinstance(location, dict) else None
+        if isinstance(address, dict):
+            parts = [address.get("addressLocality"), address.get("addressRegion"), address.get("addressCountry")]
+            parts = [part if isinstance(part, str) else (part or {}).get("name") for part in parts]
+            names.append(", ".join(part for part in parts if part))
+    if posting.get("jobLocationType") == "TELECOMMUTE":
+        names.append("Remote")
+    return "; ".join(name for name in names if name)
+
+
+def extract_json_ld(html: str, parser: str) -> str:
+    """Return a text rendering of an embedded schema.org JobPosting, or "" if there is none."""
+    for block in JSON_LD_RE.findall(html):
+        try:
+            posting = _find_job_posting(json.loads(block.strip()))
+        except (json.JSONDecodeError, ValueError):
+            continue
+        if not posting or not posting.get("description"):
+            continue
+
+        # The description is itself HTML
+        description = BACKENDS[parser](f"<html><body>{posting['description']}</body></html>", [])
+        organization = posting.get("hiringOrganization")
+        company = organization.get("name") if isinstance(organization, dict) else organization
+        employment_type = posting.get("employmentType")
+        if isinstance(employment_type, list):
+            employment_type = ", ".join(employment_type)
+
+        header = [
+            ("Title", posting.get("title")),
+            ("Company", company),
+            ("Location", _posting_location(posting)),
+            ("Employment type", employment_type),
+            ("Date posted", posting.get("datePosted")),
+        ]
+        lines = [f"{label}: {value}" for label, value in header if value]
+        return "\n".join(lines) + "\n\n" + description
+    return ""
+
+
+def _selectors_for(url: str) -> list:
+    host = urlparse(url).netloc.lower()
+    for domain, selectors in SITE_SELECTORS.items():
+        if domain in host:
+            return selectors + GENERIC_SELECTORS
+    return GENERIC_SELECTORS
+
+
+def extract_job_text(html: str, url: str = "", parser: str = None, max_chars: int = MAX_CHARS) -> str:
+    """
+    Extract a job description from a page: an embedded JSON-LD JobPosting if present,
+    otherwise the site-specific or main-content container with navigation, headers,
+    footers and scripts removed. Uses the fastest installed parser unless one is given.
+    """
+    parser = parser or available_parsers()[0]
+
+    text = extract_json_ld(html, parser)
+    if len(text) < MIN_CONTENT_CHARS:
+        text = BACKENDS[parser](html, _selectors_for(url))
+    if len(text.strip()) < MIN_CONTENT_CHARS:
+        # Too little left once the chrome is gone (the description sat inside a stripped
+        # tag): fall back to all of the body's text
+        text = BACKENDS[parser](html, [], strip=NON_TEXT_TAGS)
+
+    return _truncate(_normalize_text(text), max_chars)
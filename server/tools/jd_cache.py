@@ -0,0 +1,95 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from tools.cache import TTLCache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    content_hash TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (content_hash, kind)
+);
+"""
+
+
+def content_hash(job_description: str) -> str:
+    """Hash of the job description with whitespace normalized, so reformatted copies share entries."""
+    return hashlib.sha256(" ".join(job_description.split()).encode("utf-8")).hexdigest()
+
+
+class JobDescriptionCache:
+    """
+    Content-addressed store for data derived from a job description (company metadata,
+    requirements/keywords analysis), shared by every tool that receives the same posting.
+
+    Entries live in an in-memory LRU and, when `path` is given, in SQLite so they
+    survive restarts and are shared between server processes.
+    """
+
+    def __init__(self, path: str = None, max_size: int = 1024, ttl: float = 7 * 24 * 3600):
+        self.ttl = ttl
+        self._memory = TTLCache(max_size=max_size, ttl=ttl)
+        self._conn = None
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._lock, self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.executescript(SCHEMA)
+
+    def get(self, job_description: str, kind: str):
+        key = (content_hash(job_description), kind)
+        value = self._memory.get(key)
+        if value is not None or self._conn is None:
+            return value
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, created_at FROM analyses WHERE content_hash = ? AND kind = ?", key
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        value = json.loads(row[0])
+        self._memory.set(key, value)
+        return value
+
+    def set(self, job_description: str, kind: str, value: dict):
+        key = (content_hash(job_description), kind)
+        self._memory.set(key, value)
+        if self._conn is None:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses (content_hash, kind, data, created_at) VALUES (?, ?, ?, ?)",
+                (*key, json.dumps(value), time.time()),
+            )
+
+    def stats(self) -> dict:
+        return self._memory.stats()
+
+
+_jd_cache = None
+_jd_cache_lock = threading.Lock()
+
+
+def get_jd_cache() -> JobDescriptionCache:
+    """Return the process-wide cache; JD_CACHE_PATH enables SQLite persistence."""
+    global _jd_cache
+    with _jd_cache_lock:
+        if _jd_cache is None:
+            _jd_cache = JobDescriptionCache(
+                os.getenv("JD_CACHE_PATH") or None,
+                max_size=int(os.getenv("JD_CACHE_SIZE", "1024")),
+                ttl=float(os.getenv("JD_CACHE_TTL", str(7 * 24 * 3600))),
+            )
+        return _jd_cache
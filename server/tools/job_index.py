@@ -0,0 +1,327 @@
+import os
+import re
+import json
+import math
+import time
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+from datetime import date, datetime
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    dedupe_key TEXT NOT NULL UNIQUE,
+    job_url TEXT,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    site TEXT,
+    description TEXT,
+    data TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_job_url ON jobs (job_url);
+
+CREATE TABLE IF NOT EXISTS queries (
+    query_key TEXT PRIMARY KEY,
+    results_wanted INTEGER NOT NULL,
+    sites TEXT NOT NULL,
+    refreshed_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS query_jobs (
+    query_key TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (query_key, job_id)
+);
+"""
+
+# Full-text index over postings, kept in sync with the jobs table by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE jobs_fts USING fts5(
+    title, company, location, description,
+    content='jobs', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE TRIGGER jobs_fts_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, title, company, location, description)
+    VALUES (new.rowid, new.title, new.company, new.location, new.description);
+END;
+CREATE TRIGGER jobs_fts_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+END;
+INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild');
+"""
+
+# Only edits to indexed columns reindex a posting; the last_seen touch on every
+# repeat ingest must not delete and reinsert its FTS row
+FTS_UPDATE_TRIGGER = """
+CREATE TRIGGER jobs_fts_update AFTER UPDATE OF title, company, location, description ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+    INSERT INTO jobs_fts (rowid, title, company, location, description)
+    VALUES (new.rowid, new.title, new.company, new.location, new.description);
+END;
+"""
+
+
+def _normalize(text) -> str:
+    return " ".join(str(text or "").lower().split())
+
+
+def clean_record(record: dict) -> dict:
+    """Make a scraped jobspy row JSON-safe: NaN/NaT become None, dates become ISO strings."""
+    cleaned = {}
+    for key, value in record.items():
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            cleaned[key] = None
+        elif isinstance(value, (datetime, date)):
+            cleaned[key] = value.isoformat()
+        elif type(value).__name__ in ("NaTType", "NAType"):
+            cleaned[key] = None
+        elif hasattr(value, "item"):
+            # numpy scalars
+            cleaned[key] = value.item()
+        else:
+            cleaned[key] = value
+    return cleaned
+
+
+def dedupe_key(record: dict) -> str:
+    """Postings are the same job if title, company and location match after normalization."""
+    key = "|".join(_normalize(record.get(field)) for field in ("title", "company", "location"))
+    if key == "||":
+        return f"url:{record.get('job_url')}"
+    return key
+
+
+def job_id_for(key: str) -> str:
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def to_fts_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: "quoted phrases" stay phrases, other words
+    become quoted terms, and everything is ANDed. Avoids FTS5 syntax errors on user input.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]+)"|(\S+)', query):
+        text = (phrase or word).replace('"', "")
+        if text.strip():
+            terms.append(f'"{text}"')
+    return " ".join(terms)
+
+
+class JobIndex:
+    """
+    On-disk index of scraped postings, deduplicated across sites and searches.
+
+    Each posting is stored once (matched by job_url or normalized title/company/location)
+    with first/last seen timestamps, and each search query remembers which postings it
+    returned and when it was last refreshed.
+    """
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self.fts_enabled = self._ensure_fts()
+
+    def _ensure_fts(self) -> bool:
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+        ).fetchone()
+        try:
+            if not exists:
+                self._conn.executescript(FTS_SCHEMA)
+            trigger = self._conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'jobs_fts_update'"
+            ).fetchone()
+            if trigger is None or " UPDATE OF " not in trigger["sql"]:
+                # Indexes created before the trigger was narrowed get the new one
+                self._conn.execute("DROP TRIGGER IF EXISTS jobs_fts_update")
+                self._conn.executescript(FTS_UPDATE_TRIGGER)
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable, falling back to LIKE search: {e}")
+            return False
+
+    def _upsert_job(self, record: dict, now: float) -> str:
+        key = dedupe_key(record)
+        url = record.get("job_url")
+
+        row = self._conn.execute("SELECT id, description FROM jobs WHERE dedupe_key = ?", (key,)).fetchone()
+        if row is None and url:
+            row = self._conn.execute("SELECT id, description FROM jobs WHERE job_url = ?", (url,)).fetchone()
+
+        if row is None:
+            job_id = job_id_for(key)
+            record = dict(record, id=job_id)
+            self._conn.execute(
+                """
+                INSERT INTO jobs (id, dedupe_key, job_url, title, company, location, site,
+                                  description, data, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job_id, key, url, record.get("title"), record.get("company"),
+                    record.get("location"), record.get("site"), record.get("description"),
+                    json.dumps(record, default=str), now, now,
+                ),
+            )
+            return job_id
+
+        job_id = row["id"]
+        # Keep the richest description seen across sites
+        if len(record.get("description") or "") >= len(row["description"] or ""):
+            record = dict(record, id=job_id)
+            self._conn.execute(
+                "UPDATE jobs SET description = ?, data = ?, last_seen = ? WHERE id = ?",
+                (record.get("description"), json.dumps(record, default=str), now, job_id),
+            )
+        else:
+            self._conn.execute("UPDATE jobs SET last_seen = ? WHERE id = ?", (now, job_id))
+        return job_id
+
+    def ingest(self, query_key: str, records: list, results_wanted: int, sites: dict) -> list:
+        """Store scraped rows for a query and return their deduplicated job ids in order."""
+        now = time.time()
+        with self._lock, self._conn:
+            job_ids = []
+            for record in records:
+                record = clean_record(record)
+                # jobspy's own per-site id is kept; "id" becomes our stable, deduplicated id
+                record["source_id"] = record.pop("id", None)
+                job_id = self._upsert_job(record, now)
+                if job_id not in job_ids:
+                    job_ids.append(job_id)
+
+            self._conn.execute("DELETE FROM query_jobs WHERE query_key = ?", (query_key,))
+            self._conn.executemany(
+                "INSERT INTO query_jobs (query_key, job_id, rank) VALUES (?, ?, ?)",
+                [(query_key, job_id, rank) for rank, job_id in enumerate(job_ids)],
+            )
+            self._conn.execute(
+                """
+                INSERT INTO queries (query_key, results_wanted, sites, refreshed_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (query_key) DO UPDATE SET
+                    results_wanted = excluded.results_wanted,
+                    sites = excluded.sites,
+                    refreshed_at = excluded.refreshed_at
+                """,
+                (query_key, results_wanted, json.dumps(sites), now),
+            )
+        logger.info(f"Indexed {len(records)} postings as {len(job_ids)} unique jobs for {query_key}")
+        return job_ids
+
+    def lookup(self, query_key: str):
+        """Return (results_wanted, sites, refreshed_at, jobs) for a known query, or None."""
+        with self._lock:
+            query = self._conn.execute(
+                "SELECT results_wanted, sites, refreshed_at FROM queries WHERE query_key = ?", (query_key,)
+            ).fetchone()
+            if query is None:
+                return None
+            rows = self._conn.execute(
+                """
+                SELECT jobs.data FROM query_jobs JOIN jobs ON jobs.id = query_jobs.job_id
+                WHERE query_jobs.query_key = ? ORDER BY query_jobs.rank
+                """,
+                (query_key,),
+            ).fetchall()
+        jobs = [json.loads(row["data"]) for row in rows]
+        return query["results_wanted"], json.loads(query["sites"]), query["refreshed_at"], jobs
+
+    def search(self, query: str, location: str = "", limit: int = 10) -> list:
+        """
+        Keyword/phrase search over every indexed posting, best matches first
+        (BM25 with title and company weighted above description).
+        """
+        params = []
+        location_filter = ""
+        if location:
+            location_filter = "AND jobs.location LIKE ?"
+            params.append(f"%{location.strip()}%")
+
+        with self._lock:
+            if self.fts_enabled:
+                fts_query = to_fts_query(query)
+                if not fts_query:
+                    return []
+                rows = self._conn.execute(
+                    f"""
+                    SELECT jobs.id, jobs.title, jobs.company, jobs.location, jobs.site, jobs.job_url,
+                           jobs.last_seen,
+                           snippet(jobs_fts, 3, '**', '**', '...', 32) AS snippet
+                    FROM jobs_fts JOIN jobs ON jobs.rowid = jobs_fts.rowid
+                    WHERE jobs_fts MATCH ? {location_filter}
+                    ORDER BY bm25(jobs_fts, 10.0, 5.0, 2.0, 1.0)
+                    LIMIT ?
+                    """,
+                    [fts_query, *params, limit],
+                ).fetchall()
+            else:
+                words = query.replace('"', " ").split()
+                if not words:
+                    return []
+                conditions = " AND ".join("(jobs.title || ' ' || jobs.description) LIKE ?" for _ in words)
+                rows = self._conn.execute(
+                    f"""
+                    SELECT jobs.id, jobs.title, jobs.company, jobs.location, jobs.site, jobs.job_url,
+                           jobs.last_seen, substr(jobs.description, 1, 200) AS snippet
+                    FROM jobs
+                    WHERE {conditions} {location_filter}
+                    ORDER BY jobs.last_seen DESC
+                    LIMIT ?
+                    """,
+                    [*(f"%{word}%" for word in words), *params, limit],
+                ).fetchall()
+
+        results = []
+        for row in rows:
+            result = dict(row)
+            result["last_seen"] = datetime.fromtimestamp(row["last_seen"]).isoformat()
+            results.append(result)
+        return results
+
+    def get_job(self, job_id: str):
+        """Return the full stored posting for an id, with first/last seen times, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, first_seen, last_seen FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = json.loads(row["data"])
+        job["first_seen"] = datetime.fromtimestamp(row["first_seen"]).isoformat()
+        job["last_seen"] = datetime.fromtimestamp(row["last_seen"]).isoformat()
+        return job
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_job_index() -> JobIndex:
+    """Return the process-wide JobIndex at JOB_INDEX_PATH."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            default_path = os.path.join(tempfile.gettempdir(), "job_assistant", "jobs.db")
+            # `or`, not a getenv default: an empty JOB_INDEX_PATH= would open a throwaway temp database
+            _index = JobIndex(os.getenv("JOB_INDEX_PATH") or default_path)
+        return _index
@@ -1,21 +1,233 @@
+import os
+import json
+import time
+import asyncio
 import logging
 from jobspy import scrape_jobs
 import pandas as pd
+from tools.concurrency import run_io, run_scrape
+from tools.cache import TTLCache
+from tools.job_index import get_job_index
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+JOB_SITES = ["indeed", "linkedin", "zip_recruiter"]
 
-def search_jobs_tool(query: str, location: str = "", limit: int = 10):
+# Search results keyed by normalized (term, location, sites); values are (results_wanted, result)
+_search_cache = TTLCache(
+    max_size=int(os.getenv("JOB_SEARCH_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("JOB_SEARCH_CACHE_TTL", "900")),
+)
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def _cache_key(query: str, location: str, sites: list) -> tuple:
+    return (_normalize(query), _normalize(location), tuple(sorted(sites)))
+
+
+def _trim_per_site(jobs: list, limit: int) -> list:
+    """Keep at most `limit` jobs per site, matching scrape_jobs' per-site results_wanted."""
+    counts = {}
+    trimmed = []
+    for job in jobs:
+        site = job.get("site")
+        if counts.get(site, 0) < limit:
+            counts[site] = counts.get(site, 0) + 1
+            trimmed.append(job)
+    return trimmed
+
+
+# Fields returned per job in compact mode; full postings are fetched with get_job(id)
+COMPACT_FIELDS = [
+    "id", "title", "company", "location", "site", "job_url", "date_posted",
+    "job_type", "is_remote", "job_level",
+]
+
+
+def _format_salary(job: dict):
+    low, high = job.get("min_amount"), job.get("max_amount")
+    if low is None and high is None:
+        return None
+    amounts = "-".join(f"{amount:,.0f}" for amount in (low, high) if amount is not None)
+    parts = [job.get("currency") or "", amounts, f"/{job['interval']}" if job.get("interval") else ""]
+    return " ".join(part for part in parts[:2] if part) + parts[2]
+
+
+def _snippet(text, max_chars: int):
+    text = " ".join((text or "").split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + "..."
+
+
+def project_job(job: dict, description_chars: int = 300) -> dict:
+    """Reduce a full posting to COMPACT_FIELDS plus salary and a short description, dropping empty values."""
+    compact = {field: job.get(field) for field in COMPACT_FIELDS}
+    compact["salary"] = _format_salary(job)
+    if description_chars > 0:
+        compact["description"] = _snippet(job.get("description"), description_chars)
+    return {key: value for key, value in compact.items() if value not in (None, "", [])}
+
+
+def _project_result(result: dict, limit: int, compact: bool, description_chars: int) -> dict:
+    jobs = _trim_per_site(result["jobs"], limit)
+    if compact:
+        jobs = [project_job(job, description_chars) for job in jobs]
+    return dict(result, jobs=jobs)
+
+
+# Background refreshes of stale indexed queries, keyed by cache key
+_refreshing = {}
+
+
+async def _timed_scrape(timeout: float, **kwargs):
+    """
+    Run scrape_jobs on the scrape executor, with `timeout` counted from when a thread picks
+    it up: time queued behind other searches' scrapes does not count against a site. The
+    wait for a thread is bounded by `timeout` as well. Raises asyncio.TimeoutError.
+    """
+    loop = asyncio.get_running_loop()
+    started = asyncio.Event()
+
+    def scrape():
+        loop.call_soon_threadsafe(started.set)
+        return scrape_jobs(**kwargs)
+
+    task = asyncio.ensure_future(run_scrape(scrape))
+    waiter = asyncio.ensure_future(started.wait())
+    done, _ = await asyncio.wait({task, waiter}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    waiter.cancel()
+    if not done:
+        # Still queued: cancelling drops it before it ever runs
+        task.cancel()
+        raise asyncio.TimeoutError
+    return await asyncio.wait_for(task, timeout)
+
+
+async def _search_site(site: str, query: str, location: str, limit: int, timeout: float):
+    """Scrape a single site, returning (site, status, records)."""
+    try:
+        jobs = await _timed_scrape(
+            timeout,
+            site_name=[site],
+            search_term=query,
+            location=location,
+            results_wanted=limit
+        )
+        return site, "ok", jobs.to_dict(orient="records")
+    except asyncio.TimeoutError:
+        # The scrape thread keeps running (on the scrape executor only); we just stop waiting for it
+        logger.warning(f"{site} search timed out after {timeout}s")
+        return site, "timeout", []
+    except Exception as e:
+        logger.error(f"{site} search failed: {e}")
+        return site, f"error: {e}", []
+
+
+async def _scrape_and_index(key: tuple, query: str, location: str, limit: int) -> dict:
+    """Scrape all sites concurrently, ingest the rows into the job index and return the deduplicated result."""
+    timeout = float(os.getenv("JOB_SEARCH_SITE_TIMEOUT", "20"))
+
+    tasks = [_search_site(site, query, location, limit, timeout) for site in JOB_SITES]
+
+    records = []
+    sites = {}
+    for finished in asyncio.as_completed(tasks):
+        site, status, site_records = await finished
+        sites[site] = status
+        records.extend(site_records)
+        logger.info(f"{site}: {status} ({len(site_records)} jobs)")
+
+    index = get_job_index()
+    index_key = json.dumps(key)
+    await run_io(index.ingest, index_key, records, limit, sites)
+    _, _, _, jobs = await run_io(index.lookup, index_key)
+
+    result = {"jobs": jobs, "sites": sites}
+
+    # Only cache complete results so a timed-out site is retried next time
+    if all(status == "ok" for status in sites.values()):
+        _search_cache.set(key, (limit, result))
+
+    return result
+
+
+def _schedule_refresh(key: tuple, query: str, location: str, limit: int):
+    if key in _refreshing:
+        return
+
+    async def refresh():
+        try:
+            await _scrape_and_index(key, query, location, limit)
+        except Exception as e:
+            logger.error(f"Background refresh failed for {key}: {e}")
+        finally:
+            _refreshing.pop(key, None)
+
+    logger.info(f"Refreshing stale job search {key} in the background")
+    _refreshing[key] = asyncio.create_task(refresh())
+
+
+async def search_jobs_tool(
+    query: str,
+    location: str = "",
+    limit: int = 10,
+    compact: bool = True,
+    description_chars: int = 300,
+):
     """
     Search job listings using python-jobspy.
     Returns the most recent job postings that match a given title or keyword.
+
+    Each site is scraped concurrently with its own timeout (JOB_SEARCH_SITE_TIMEOUT),
+    so a slow or failing site only loses its own results. Results are deduplicated
+    in the local job index; a query seen before is answered from the index and
+    refreshed in the background once older than JOB_INDEX_REFRESH_AFTER seconds.
+
+    In compact mode each job is projected to a few fields and a description
+    snippet of description_chars characters; get_job_tool(id) returns the full posting.
+    """
+    key = _cache_key(query, location, JOB_SITES)
+    # A cached search for more results can serve any smaller request
+    cached = _search_cache.get(key, accept=lambda entry: entry[0] >= limit)
+    if cached is not None:
+        logger.info(f"Job search cache hit for {key} ({_search_cache.stats()})")
+        return _project_result(dict(cached[1], cached=True), limit, compact, description_chars)
+    logger.info(f"Job search cache miss for {key} ({_search_cache.stats()})")
+
+    index = get_job_index()
+    indexed = await run_io(index.lookup, json.dumps(key))
+    if indexed is not None:
+        indexed_limit, sites, refreshed_at, jobs = indexed
+        if indexed_limit >= limit:
+            refresh_after = float(os.getenv("JOB_INDEX_REFRESH_AFTER", "21600"))
+            complete = all(status == "ok" for status in sites.values())
+            if not complete or time.time() - refreshed_at > refresh_after:
+                _schedule_refresh(key, query, location, indexed_limit)
+            result = {"jobs": jobs, "sites": sites, "cached": True}
+            return _project_result(result, limit, compact, description_chars)
+
+    result = await _scrape_and_index(key, query, location, limit)
+    return _project_result(result, limit, compact, description_chars)
+
+
+async def search_saved_jobs_tool(query: str, location: str = "", limit: int = 10) -> list:
+    """
+    Full-text search over every posting previously scraped into the job index.
+    Never contacts a job board.
     """
-    jobs = scrape_jobs(
-        site_name=["indeed", "linkedin", "zip_recruiter"],
-        search_term=query,
-        location=location,
-        results_wanted=limit
-    )
-    return jobs.to_dict(orient="records")
+    index = get_job_index()
+    return await run_io(index.search, query, location, limit)
+
 
+async def get_job_tool(job_id: str) -> dict:
+    """Return the full stored posting (including the complete description) for a job id."""
+    index = get_job_index()
+    job = await run_io(index.get_job, job_id)
+    if job is None:
+        return {"error": f"No job with id {job_id}. Use an id returned by search_jobs or search_saved_jobs."}
+    return job
@@ -0,0 +1,130 @@
+import os
+import zlib
+import time
+import sqlite3
+import logging
+import tempfile
+import threading
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    html BLOB NOT NULL,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    validated_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+"""
+
+
+class PageCache:
+    """
+    On-disk cache of scraped pages: compressed raw HTML plus the extracted text,
+    with the ETag/Last-Modified validators needed for conditional GETs.
+
+    Entries are fresh for `ttl` seconds after their last validation; after that the
+    caller revalidates them. Total stored size is bounded by `max_bytes`, evicting
+    the least recently read pages first.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600.0, max_bytes: int = 200 * 1024 * 1024):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def get(self, url: str, include_html: bool = False):
+        """
+        Return a dict with text, fresh and the conditional request headers for a cached
+        url, or None. The stored HTML is only read and decompressed with include_html.
+        """
+        now = time.time()
+        columns = "etag, last_modified, text, validated_at" + (", html" if include_html else "")
+        with self._lock, self._conn:
+            row = self._conn.execute(f"SELECT {columns} FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+
+        validators = {}
+        if row["etag"]:
+            validators["If-None-Match"] = row["etag"]
+        if row["last_modified"]:
+            validators["If-Modified-Since"] = row["last_modified"]
+
+        page = {
+            "text": row["text"],
+            "fresh": now - row["validated_at"] < self.ttl,
+            "validators": validators,
+        }
+        if include_html:
+            page["html"] = zlib.decompress(row["html"]).decode("utf-8", errors="replace")
+        return page
+
+    def revalidated(self, url: str):
+        """Mark a cached page as confirmed current (the server answered 304)."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pages SET validated_at = ?, accessed_at = ? WHERE url = ?", (now, now, url)
+            )
+
+    def put(self, url: str, html: str, text: str, etag: str = None, last_modified: str = None):
+        now = time.time()
+        compressed = zlib.compress(html.encode("utf-8"))
+        size = len(compressed) + len(text.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO pages
+                    (url, etag, last_modified, html, text, size, validated_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (url, etag, last_modified, compressed, text, size, now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for row in self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (row["url"],))
+            total -= row["size"]
+            evicted += 1
+        logger.info(f"Page cache evicted {evicted} pages, {total} bytes remain")
+
+
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Return the process-wide PageCache configured by PAGE_CACHE_PATH/TTL/MAX_BYTES."""
+    global _page_cache
+    with _page_cache_lock:
+        if _page_cache is None:
+            default_path = os.path.join(tempfile.gettempdir(), "job_assistant", "pages.db")
+            _page_cache = PageCache(
+                # An empty PAGE_CACHE_PATH= must not open a throwaway temp database
+                os.getenv("PAGE_CACHE_PATH") or default_path,
+                ttl=float(os.getenv("PAGE_CACHE_TTL", "3600")),
+                max_bytes=int(os.getenv("PAGE_CACHE_MAX_BYTES", str(200 * 1024 * 1024))),
+            )
+        return _page_cache
@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+import openai
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Transient failures worth retrying besides 429
+RETRYABLE_ERRORS = (openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError)
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at `rate` units per second up to `capacity`.
+    Callers reserve up front (the balance may go negative) and then sleep off the deficit,
+    so waiters are served in arrival order without a lock.
+    """
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Take amount (capped at capacity) and return the seconds waited for it."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= min(amount, self.capacity)
+        wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def refund(self, amount: float):
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """
+    Client-side limiter for Azure OpenAI chat completions: requests-per-minute and
+    estimated tokens-per-minute buckets, plus retries of 429s (honoring retry-after)
+    and transient errors with jittered exponential backoff. Limits of 0 disable a bucket.
+    """
+
+    def __init__(self, rpm: int = 0, tpm: int = 0, max_retries: int = 4, backoff: float = 1.0,
+                 completion_tokens: int = 1000):
+        self.requests = TokenBucket(rpm, rpm / 60) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm, tpm / 60) if tpm > 0 else None
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.completion_tokens = completion_tokens
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @classmethod
+    def from_env(cls, getenv=os.getenv):
+        """Build from AZURE_OPENAI_* settings; getenv(name, default) lets callers resolve overrides."""
+        return cls(
+            rpm=int(getenv("AZURE_OPENAI_RPM", "0")),
+            tpm=int(getenv("AZURE_OPENAI_TPM", "0")),
+            max_retries=int(getenv("AZURE_OPENAI_MAX_RETRIES", "4")),
+            backoff=float(getenv("AZURE_OPENAI_RETRY_BACKOFF", "1")),
+            completion_tokens=int(getenv("AZURE_OPENAI_COMPLETION_TOKEN_ESTIMATE", "1000")),
+        )
+
+    def estimate_tokens(self, kwargs: dict) -> int:
+        """Rough prompt size (~4 characters per token) plus the expected completion."""
+        prompt = json.dumps(kwargs.get("messages", []), default=str)
+        if kwargs.get("tools"):
+            prompt += json.dumps(kwargs["tools"])
+        completion = kwargs.get("max_tokens") or kwargs.get("max_completion_tokens") or self.completion_tokens
+        return len(prompt) // 4 + completion
+
+    def _retry_delay(self, attempt: int, error: Exception = None) -> float:
+        """retry-after(-ms) from a 429 when present, otherwise jittered exponential backoff."""
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after_ms = response.headers.get("retry-after-ms", "")
+            retry_after = response.headers.get("retry-after", "")
+            try:
+                if retry_after_ms:
+                    return min(float(retry_after_ms) / 1000, 60.0)
+                if retry_after:
+                    return min(float(retry_after), 60.0)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    async def _wait_for_capacity(self, estimated: int) -> float:
+        waited = 0.0
+        if self.requests is not None:
+            waited += await self.requests.acquire(1)
+        if self.tokens is not None:
+            waited += await self.tokens.acquire(estimated)
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        if waited > 1:
+            logger.info(f"Waited {waited:.2f}s for Azure OpenAI capacity (~{estimated} tokens)")
+        return waited
+
+    def _refund(self, estimated: int):
+        """Give back a failed attempt's token reservation so retries don't drain the TPM budget."""
+        if self.tokens is not None:
+            self.tokens.refund(estimated)
+
+    async def call(self, create, **kwargs):
+        """Await create(**kwargs) within the limits, retrying 429s and transient errors."""
+        estimated = self.estimate_tokens(kwargs)
+        self.calls += 1
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_capacity(estimated)
+            try:
+                response = await create(**kwargs)
+            except openai.RateLimitError as e:
+                self.throttled += 1
+                self._refund(estimated)
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt, e)
+            except RETRYABLE_ERRORS as e:
+                self._refund(estimated)
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+            else:
+                # Return the unused part of the estimate once real usage is known (not for streams)
+                usage = getattr(response, "usage", None)
+                if self.tokens is not None and usage is not None and usage.total_tokens < estimated:
+                    self.tokens.refund(estimated - usage.total_tokens)
+                return response
+
+            self.retries += 1
+            logger.warning(f"Azure OpenAI call failed, retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "avg_wait_seconds": round(self.wait_seconds / self.calls, 3) if self.calls else 0.0,
+        }
+
+
+def rate_limited(client, limiter: RateLimiter):
+    """Route client.chat.completions.create through limiter; disables the SDK's own retries."""
+    create = client.with_options(max_retries=0).chat.completions.create
+
+    async def limited_create(**kwargs):
+        return await limiter.call(create, **kwargs)
+
+    client.chat.completions.create = limited_create
+    client.rate_limiter = limiter
+    return client
@@ -1,220 +1,190 @@
 import os
+import re
 import json
-import tempfile
+import time
+import logging
 import traceback
-import base64
-from docx import Document
-from docx.shared import Pt, Inches, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from openai import AzureOpenAI
 from datetime import datetime
 from dotenv import load_dotenv
+from tools.concurrency import run_blocking
+from tools.azure_clients import get_azure_client, get_deployment
+from tools.jd_cache import get_jd_cache
+from tools.artifacts import get_artifact_store
+from tools.docx_render import render_resume, render_cover_letter
 
 load_dotenv()
 
+# Configure logging
+logger = logging.getLogger(__name__)
 
-def get_azure_client():
-    return AzureOpenAI(
-        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
-        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+
+def sanitize_filename(name: str) -> str:
+    """Sanitize string for use in filename"""
+    return "".join(c for c in name if c.isalnum() or c in (" ", "-", "_")).strip().replace(" ", "_")
+
+
+# Minimum seconds between partial previews pushed while a document is streaming
+PREVIEW_INTERVAL = float(os.getenv("STREAM_PREVIEW_INTERVAL", "0.25"))
+
+
+def partial_json_string(text: str, key: str):
+    """
+    Return the (possibly unterminated) string value of key from a JSON document that is
+    still being streamed, or None if the value has not started yet.
+    """
+    # The key's colon must have arrived and the value must be a string ("key": null is not)
+    marker = re.search(rf'"{re.escape(key)}"\s*:\s*', text)
+    if marker is None or not text.startswith('"', marker.end()):
+        return None
+    start = marker.end()
+
+    end = start + 1
+    while end < len(text) and text[end] != '"':
+        end += 2 if text[end] == "\\" else 1
+    raw = text[start + 1:min(end, len(text))]
+
+    # Drop a trailing escape sequence that hasn't fully arrived yet
+    for trim in range(0, 7):
+        try:
+            return json.loads(f'"{raw[:len(raw) - trim]}"')
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+async def _complete_json(client, deployment_name: str, system: str, prompt: str, on_preview=None) -> str:
+    """
+    Run a JSON-mode chat completion and return the content. With on_preview, the completion
+    is streamed and on_preview(text) receives the growing "preview_markdown" value
+    (at most every PREVIEW_INTERVAL seconds, plus once when it is complete).
+    """
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": prompt},
+    ]
+    if on_preview is None:
+        response = await client.chat.completions.create(
+            model=deployment_name,
+            messages=messages,
+            response_format={"type": "json_object"},
+        )
+        return response.choices[0].message.content
+
+    stream = await client.chat.completions.create(
+        model=deployment_name,
+        messages=messages,
+        response_format={"type": "json_object"},
+        stream=True,
     )
+    chunks = []
+    sent = ""
+    last_sent = 0.0
+    async for chunk in stream:
+        if not chunk.choices or not chunk.choices[0].delta.content:
+            continue
+        chunks.append(chunk.choices[0].delta.content)
+
+        if time.monotonic() - last_sent < PREVIEW_INTERVAL:
+            continue
+        preview = partial_json_string("".join(chunks), "preview_markdown")
+        if preview and preview != sent:
+            await on_preview(preview)
+            sent, last_sent = preview, time.monotonic()
+
+    content = "".join(chunks)
+    preview = partial_json_string(content, "preview_markdown")
+    if preview and preview != sent:
+        await on_preview(preview)
+    return content
+
+
+# Asked for inline when a job description has not been analyzed yet, so the
+# analysis costs no extra round trip and is reused by every later tool call
+JOB_ANALYSIS_INSTRUCTION = """
+    Job analysis:
+    - Also return "job_analysis", extracted ONLY from the JOB DESCRIPTION (never from the resume):
+      company_name and company_location (city and state), each null if not clearly stated,
+      the job_title, up to 8 key requirements, and up to 15 keywords an ATS would screen for.
+    """
 
+JOB_ANALYSIS_FIELD = """
+        "job_analysis": {
+            "company_name": "Company Name or null",
+            "company_location": "City, State or null",
+            "job_title": "...",
+            "requirements": ["...", "..."],
+            "keywords": ["...", "..."]
+        },"""
 
-def add_section_heading(doc: Document, text: str):
-    """Add a formatted section heading (compact for one-page layout)"""
-    heading = doc.add_paragraph(text)
-    heading_run = heading.runs[0]
-    heading_run.font.size = Pt(11)
-    heading_run.font.bold = True
-    heading_run.font.color.rgb = RGBColor(0, 0, 0)
-    heading.paragraph_format.space_before = Pt(6)
-    heading.paragraph_format.space_after = Pt(4)
 
+def _clean_meta_value(value):
+    if not isinstance(value, str) or value.strip().lower() in ("", "null", "none", "n/a"):
+        return None
+    return value.strip()
 
-def sanitize_filename(name: str) -> str:
-    """Sanitize string for use in filename"""
-    return "".join(c for c in name if c.isalnum() or c in (" ", "-", "_")).strip().replace(" ", "_")
+
+def _has_company(meta) -> bool:
+    """Whether cached metadata/analysis actually names the company or its location."""
+    return bool(meta) and bool(meta.get("company_name") or meta.get("company_location"))
 
 
-def create_resume_docx(data: dict) -> str:
-    """Create a professionally formatted resume in .docx format"""
-    doc = Document()
-
-    # Set tight margins
-    sections = doc.sections
-    for section in sections:
-        section.top_margin = Inches(0.4)
-        section.bottom_margin = Inches(0.4)
-        section.left_margin = Inches(0.5)
-        section.right_margin = Inches(0.5)
-
-    # Name
-    name_para = doc.add_paragraph(data.get("name", ""))
-    name_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    if name_para.runs:
-        name_run = name_para.runs[0]
-        name_run.font.size = Pt(16)
-        name_run.font.bold = True
-    name_para.paragraph_format.space_after = Pt(2)
-
-    # Contact
-    contact = data.get("contact", {})
-    contact_parts = []
-    if contact.get("email"):
-        contact_parts.append(contact["email"])
-    if contact.get("phone"):
-        contact_parts.append(contact["phone"])
-    if contact.get("location"):
-        contact_parts.append(contact["location"])
-    if contact.get("linkedin"):
-        contact_parts.append(contact["linkedin"])
-
-    if contact_parts:
-        contact_para = doc.add_paragraph(" | ".join(contact_parts))
-        contact_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        if contact_para.runs:
-            contact_para.runs[0].font.size = Pt(9)
-        contact_para.paragraph_format.space_after = Pt(6)
-
-    # Summary
-    if data.get("summary"):
-        add_section_heading(doc, "PROFESSIONAL SUMMARY")
-        summary_para = doc.add_paragraph(data["summary"])
-        summary_para.paragraph_format.space_after = Pt(6)
-        for run in summary_para.runs:
-            run.font.size = Pt(10)
-
-    # Education
-    if data.get("education"):
-        add_section_heading(doc, "EDUCATION")
-        for edu in data["education"]:
-            edu_para = doc.add_paragraph()
-            edu_para.paragraph_format.space_after = Pt(1)
-            degree_run = edu_para.add_run(edu.get("degree", ""))
-            degree_run.bold = True
-            degree_run.font.size = Pt(10)
-
-            school_para = doc.add_paragraph(
-                f"{edu.get('school', '')} - {edu.get('location', '')} | {edu.get('graduation', '')}"
-            )
-            school_para.paragraph_format.space_after = Pt(4)
-            if school_para.runs:
-                school_para.runs[0].font.size = Pt(9)
-
-    # Experience
-    if data.get("experience"):
-        add_section_heading(doc, "EXPERIENCE")
-        for i, exp in enumerate(data["experience"]):
-            title_para = doc.add_paragraph()
-            title_para.paragraph_format.space_after = Pt(1)
-            title_run = title_para.add_run(f"{exp.get('title', '')} - {exp.get('company', '')}")
-            title_run.bold = True
-            title_run.font.size = Pt(10)
-
-            details_para = doc.add_paragraph()
-            details_para.paragraph_format.space_after = Pt(2)
-            details_run = details_para.add_run(
-                f"{exp.get('location', '')} | {exp.get('dates', '')}"
-            )
-            details_run.italic = True
-            details_run.font.size = Pt(9)
-
-            if exp.get("responsibilities"):
-                for resp in exp["responsibilities"]:
-                    try:
-                        bullet_para = doc.add_paragraph(resp, style="List Bullet")
-                    except KeyError:
-                        bullet_para = doc.add_paragraph(f"• {resp}")
-                    
-                    bullet_para.paragraph_format.space_after = Pt(1)
-                    bullet_para.paragraph_format.line_spacing = 1.0
-                    for run in bullet_para.runs:
-                        run.font.size = Pt(10)
-
-            if i < len(data["experience"]) - 1:
-                doc.add_paragraph().paragraph_format.space_after = Pt(4)
-
-    # Skills
-    if data.get("skills"):
-        add_section_heading(doc, "SKILLS")
-        skills_para = doc.add_paragraph(", ".join(data["skills"]))
-        for run in skills_para.runs:
-            run.font.size = Pt(10)
-
-    # Save to temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-        doc.save(tmp.name)
-        return tmp.name
-
-
-def create_cover_letter_docx(data: dict) -> str:
-    """Create a professionally formatted cover letter in .docx format"""
-    doc = Document()
-
-    # Set normal margins
-    sections = doc.sections
-    for section in sections:
-        section.top_margin = Inches(1)
-        section.bottom_margin = Inches(1)
-        section.left_margin = Inches(1)
-        section.right_margin = Inches(1)
-
-    # Applicant Name
-    name_para = doc.add_paragraph(data.get("name", ""))
-    if name_para.runs:
-        name_para.runs[0].font.size = Pt(12)
-        name_para.runs[0].font.bold = True
-    name_para.paragraph_format.space_after = Pt(0)
-
-    # Contact
-    contact = data.get("contact", {})
-    if contact.get("address"):
-        doc.add_paragraph(contact["address"]).paragraph_format.space_after = Pt(0)
-    if contact.get("phone"):
-        doc.add_paragraph(contact["phone"]).paragraph_format.space_after = Pt(0)
-    if contact.get("email"):
-        doc.add_paragraph(contact["email"]).paragraph_format.space_after = Pt(12)
-
-    # Date
-    if data.get("date"):
-        doc.add_paragraph(data["date"]).paragraph_format.space_after = Pt(12)
-
-    # Recipient
-    recipient = data.get("recipient", {})
-    if recipient:
-        for key in ["name", "title", "company", "address"]:
-            if recipient.get(key):
-                doc.add_paragraph(recipient[key]).paragraph_format.space_after = Pt(0)
-        doc.add_paragraph().paragraph_format.space_after = Pt(12)
-
-    # Body
-    if data.get("body_paragraphs"):
-        for paragraph in data["body_paragraphs"]:
-            p = doc.add_paragraph(paragraph)
-            p.paragraph_format.space_after = Pt(12)
-            p.paragraph_format.line_spacing = 1.15
-
-    # Closing
-    doc.add_paragraph("Sincerely,").paragraph_format.space_after = Pt(12)
-    doc.add_paragraph(data.get("name", ""))
-
-    # Save to temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-        doc.save(tmp.name)
-        return tmp.name
-
-
-def tailor_resume_tool(resume_text: str, job_description: str) -> str:
+def _store_job_analysis(job_description: str, analysis) -> dict:
+    """
+    Normalize a model-produced job analysis and cache it (and its metadata) for this job
+    description. A missing or malformed analysis is returned as all-null and not cached,
+    so later calls extract it again instead of trusting the nulls.
+    """
+    if not isinstance(analysis, dict):
+        logger.warning("Model returned no job_analysis; not caching it")
+        return {"company_name": None, "company_location": None, "job_title": None, "requirements": [], "keywords": []}
+    analysis = {
+        "company_name": _clean_meta_value(analysis.get("company_name")),
+        "company_location": _clean_meta_value(analysis.get("company_location")),
+        "job_title": _clean_meta_value(analysis.get("job_title")),
+        "requirements": [item for item in analysis.get("requirements") or [] if isinstance(item, str)],
+        "keywords": [item for item in analysis.get("keywords") or [] if isinstance(item, str)],
+    }
+    cache = get_jd_cache()
+    cache.set(job_description, "analysis", analysis)
+    cache.set(job_description, "metadata", {
+        "company_name": analysis["company_name"],
+        "company_location": analysis["company_location"],
+    })
+    return analysis
+
+
+def _analysis_guidance(analysis: dict) -> str:
+    """Render a cached job analysis as prompt guidance."""
+    lines = ["Job analysis (already extracted from the job description):"]
+    if analysis.get("job_title"):
+        lines.append(f"- Job title: {analysis['job_title']}")
+    if analysis.get("requirements"):
+        lines.append("- Key requirements: " + "; ".join(analysis["requirements"]))
+    if analysis.get("keywords"):
+        lines.append("- Keywords to reflect where truthful: " + ", ".join(analysis["keywords"]))
+    return "\n    ".join(lines)
+
+
+async def tailor_resume_document(resume_text: str, job_description: str, on_preview=None) -> dict:
     """
-    Tailors a resume and returns a JSON string with 'preview' (markdown) and 'file_content' (base64).
+    Tailors a resume and renders it. Returns {"preview" (markdown), "filename", "content" (DOCX bytes)};
+    raises on failure. on_preview, if given, is awaited with the partial preview while the
+    model is still writing.
     """
     client = get_azure_client()
-    deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
+    deployment_name = get_deployment()
+
+    analysis = get_jd_cache().get(job_description, "analysis")
+    if analysis is not None:
+        analysis_instruction, analysis_field = _analysis_guidance(analysis), ""
+    else:
+        analysis_instruction, analysis_field = JOB_ANALYSIS_INSTRUCTION, JOB_ANALYSIS_FIELD
 
     prompt = f"""
     You are an expert career coach and resume writer.
     
+    {analysis_instruction}
+    
     JOB DESCRIPTION:
     {job_description}
     
@@ -224,8 +194,9 @@ def tailor_resume_tool(resume_text: str, job_description: str) -> str:
     Task: Rewrite the resume to better match the job description.
     
     OUTPUT FORMAT:
-    Return a JSON object with the following structure:
+    Return a JSON object with the following structure, starting with "preview_markdown":
     {{
+        "preview_markdown": "A brief markdown summary of the changes made and why.",{analysis_field}
         "name": "Candidate Name",
         "contact": {{ "email": "...", "phone": "...", "location": "...", "linkedin": "..." }},
         "summary": "Professional summary...",
@@ -235,62 +206,64 @@ def tailor_resume_tool(resume_text: str, job_description: str) -> str:
         "education": [
             {{ "degree": "...", "school": "...", "location": "...", "graduation": "..." }}
         ],
-        "skills": ["...", "..."],
-        "preview_markdown": "A brief markdown summary of the changes made and why."
+        "skills": ["...", "..."]
     }}
     """
 
-    response = client.chat.completions.create(
-        model=deployment_name,
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant that outputs JSON."},
-            {"role": "user", "content": prompt},
-        ],
-        response_format={"type": "json_object"},
+    content = await _complete_json(
+        client, deployment_name, "You are a helpful assistant that outputs JSON.", prompt, on_preview
     )
 
-    try:
-        content = response.choices[0].message.content
-        data = json.loads(content)
-
-        # Generate DOCX
-        file_path = create_resume_docx(data)
-        
-        if not file_path:
-            return json.dumps({"error": "Failed to create resume document"})
-
-        # Read file and encode as base64
-        with open(file_path, "rb") as f:
-            file_bytes = f.read()
-        
-        file_content_b64 = base64.b64encode(file_bytes).decode('utf-8')
-        
-        # Clean up temp file
-        os.unlink(file_path)
-
-        # Generate dynamic filename
-        safe_name = sanitize_filename(data.get("name", "Candidate"))
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        filename = f"Resume_{safe_name}_{date_str}.docx"
-
-        result = {
-            "preview": data.get("preview_markdown", "Resume tailored successfully."),
-            "file_content": file_content_b64,
-            "filename": filename,
-        }
-        return json.dumps(result)
+    data = json.loads(content)
+
+    if analysis is None:
+        _store_job_analysis(job_description, data.pop("job_analysis", None))
+
+    # Generate DOCX
+    file_bytes = await run_blocking(render_resume, data)
+    if not file_bytes:
+        raise ValueError("Failed to create resume document")
+
+    # Generate dynamic filename
+    safe_name = sanitize_filename(data.get("name", "Candidate"))
+    date_str = datetime.now().strftime("%Y-%m-%d")
+
+    return {
+        "preview": data.get("preview_markdown", "Resume tailored successfully."),
+        "filename": f"Resume_{safe_name}_{date_str}.docx",
+        "content": file_bytes,
+    }
 
+
+async def tailor_resume_tool(resume_text: str, job_description: str, on_preview=None) -> str:
+    """
+    Tailors a resume and returns a JSON string with 'preview' (markdown) and a reference to the
+    DOCX in the artifact store ('artifact_id', 'uri', 'path', 'filename', ...).
+    on_preview, if given, is awaited with the partial preview while the model is still writing.
+    """
+    try:
+        document = await tailor_resume_document(resume_text, job_description, on_preview)
     except Exception as e:
         return json.dumps({"error": f"Failed to generate resume: {str(e)}"})
 
+    result = {
+        "preview": document["preview"],
+        **get_artifact_store().put(document["content"], document["filename"]),
+    }
+    return json.dumps(result)
 
-def extract_job_metadata(job_description: str) -> dict:
+
+async def extract_job_metadata(job_description: str) -> dict:
     """
     Extracts company_name and company_location from the job description
-    using a small, constrained JSON schema.
+    using a small, constrained JSON schema. Results are cached per job description.
     """
-    client = get_azure_client()
-    deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
+    cached = get_jd_cache().get(job_description, "metadata")
+    if _has_company(cached):
+        return dict(cached)
+
+    client = get_azure_client("metadata")
+    deployment_name = get_deployment("metadata")
 
     prompt = f"""
     You are an information extraction assistant.
@@ -309,7 +282,7 @@ def extract_job_metadata(job_description: str) -> dict:
     }}
     """
 
-    resp = client.chat.completions.create(
+    resp = await client.chat.completions.create(
         model=deployment_name,
         messages=[
             {"role": "system", "content": "You are a helpful assistant that outputs ONLY valid JSON."},
@@ -332,25 +305,28 @@ def extract_job_metadata(job_description: str) -> dict:
     if "company_location" not in meta:
         meta["company_location"] = None
 
+    get_jd_cache().set(job_description, "metadata", meta)
     return meta
 
 
-def generate_cover_letter_tool(resume_text: str, job_description: str) -> str:
-    """
-    Generates a cover letter and returns a JSON string with 'preview' (markdown) and 'file_content' (base64).
-    Company name and location are extracted once and then enforced.
+def _cover_letter_prompt(
+    resume_text: str,
+    job_description: str,
+    current_date: str,
+    company_name,
+    company_location,
+    analysis,
+    extract_analysis: bool,
+) -> str:
+    if extract_analysis:
+        # Single-call mode: the model extracts the metadata as part of the same response
+        meta_instruction = JOB_ANALYSIS_INSTRUCTION + """
+    recipient.company MUST equal job_analysis.company_name and recipient.address MUST equal
+    job_analysis.company_location whenever they are not null.
     """
-    client = get_azure_client()
-    deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
-
-    current_date = datetime.now().strftime("%B %d, %Y")
-
-    # Extract company metadata first
-    job_meta = extract_job_metadata(job_description)
-    company_name = job_meta.get("company_name")
-    company_location = job_meta.get("company_location")
-
-    meta_instruction = f"""
+        meta_fields = JOB_ANALYSIS_FIELD
+    else:
+        meta_instruction = f"""
     Company metadata (must be used exactly as provided):
     - company_name: {company_name or "null"}
     - company_location: {company_location or "null"}
@@ -359,8 +335,11 @@ def generate_cover_letter_tool(resume_text: str, job_description: str) -> str:
     If company_location is not null, you MUST include it in the recipient address.
     Do NOT invent or change the company name or location.
     """
+        if analysis:
+            meta_instruction += "\n    " + _analysis_guidance(analysis)
+        meta_fields = ""
 
-    prompt = f"""
+    return f"""
     You are an expert career coach.
     Today is {current_date}.
     
@@ -376,12 +355,13 @@ def generate_cover_letter_tool(resume_text: str, job_description: str) -> str:
     IMPORTANT:
     - Do NOT include a closing salutation (like "Sincerely," or "Best regards,") in the body_paragraphs.
       The system will add this automatically.
-    - Use the provided company_name and company_location exactly as given. If they are null, you may infer
+    - Use the company_name and company_location exactly as given. If they are null, you may infer
       from the job description, but prefer leaving fields generic (e.g. just company name) over guessing.
     
     OUTPUT FORMAT:
-    Return a JSON object with the following structure:
+    Return a JSON object with the following structure, starting with "preview_markdown":
     {{
+        "preview_markdown": "A brief markdown summary of the cover letter strategy.",{meta_fields}
         "name": "Candidate Name",
         "contact": {{ "email": "...", "phone": "...", "address": "..." }},
         "date": "{current_date}",
@@ -390,60 +370,106 @@ def generate_cover_letter_tool(resume_text: str, job_description: str) -> str:
             "company": "{company_name or ''}",
             "address": "{company_location or ''}"
         }},
-        "body_paragraphs": ["Para 1...", "Para 2...", "Para 3..."],
-        "preview_markdown": "A brief markdown summary of the cover letter strategy."
+        "body_paragraphs": ["Para 1...", "Para 2...", "Para 3..."]
     }}
     """
 
-    response = client.chat.completions.create(
-        model=deployment_name,
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant that outputs JSON only."},
-            {"role": "user", "content": prompt},
-        ],
-        response_format={"type": "json_object"},
+
+async def generate_cover_letter_document(
+    resume_text: str, job_description: str, mode: str = None, on_preview=None
+) -> dict:
+    """
+    Generates a cover letter and renders it. Returns {"preview" (markdown), "filename",
+    "content" (DOCX bytes)}; raises on failure. Company name and location are extracted
+    once and then enforced. on_preview, if given, is awaited with the partial preview
+    while the model is still writing.
+
+    mode (default COVER_LETTER_MODE, "single") controls how the metadata is obtained.
+    Metadata cached for the same job description is reused when it names the company or
+    its location. Otherwise "single" extracts it in the same request as the letter and
+    "two_step" calls extract_job_metadata first (one extra round trip).
+    """
+    client = get_azure_client()
+    deployment_name = get_deployment()
+    mode = mode or os.getenv("COVER_LETTER_MODE", "single")
+
+    current_date = datetime.now().strftime("%B %d, %Y")
+    started = time.perf_counter()
+
+    cache = get_jd_cache()
+    analysis = cache.get(job_description, "analysis")
+    job_meta = analysis or cache.get(job_description, "metadata")
+    if not _has_company(job_meta):
+        # Nothing cached, or only nulls: extract again rather than let the model pick the company
+        job_meta = None
+        if mode == "two_step":
+            job_meta = await extract_job_metadata(job_description)
+            logger.info(f"Cover letter metadata extracted in {time.perf_counter() - started:.2f}s")
+
+    extract_in_call = job_meta is None
+    company_name = None if extract_in_call else job_meta.get("company_name")
+    company_location = None if extract_in_call else job_meta.get("company_location")
+
+    prompt = _cover_letter_prompt(
+        resume_text, job_description, current_date, company_name, company_location, analysis, extract_in_call
     )
 
-    try:
-        content = response.choices[0].message.content
-        data = json.loads(content)
-
-        # Enforce extracted company name and location
-        if company_name:
-            data.setdefault("recipient", {})
-            data["recipient"]["company"] = company_name
-        if company_location:
-            data.setdefault("recipient", {})
-            data["recipient"]["address"] = company_location
-
-        # Generate DOCX
-        file_path = create_cover_letter_docx(data)
-        
-        if not file_path:
-            return json.dumps({"error": "Failed to create cover letter document"})
-
-        # Read file and encode as base64
-        with open(file_path, "rb") as f:
-            file_bytes = f.read()
-        
-        file_content_b64 = base64.b64encode(file_bytes).decode('utf-8')
-        
-        # Clean up temp file
-        os.unlink(file_path)
-
-        # Generate dynamic filename
-        safe_name = sanitize_filename(data.get("name", "Candidate"))
-        recipient_company = data.get("recipient", {}).get("company", "Company")
-        safe_company = sanitize_filename(recipient_company)
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        filename = f"CoverLetter_{safe_name}_{safe_company}_{date_str}.docx"
-
-        result = {
-            "preview": data.get("preview_markdown", "Cover letter generated successfully."),
-            "file_content": file_content_b64,
-            "filename": filename,
-        }
-        return json.dumps(result)
+    content = await _complete_json(
+        client, deployment_name, "You are a helpful assistant that outputs JSON only.", prompt, on_preview
+    )
+    logger.info(
+        f"Cover letter generated in {time.perf_counter() - started:.2f}s "
+        f"(mode={mode}, metadata={'in-call' if extract_in_call else 'provided'})"
+    )
 
+    data = json.loads(content)
+
+    if extract_in_call:
+        extracted = _store_job_analysis(job_description, data.pop("job_analysis", None))
+        company_name = extracted["company_name"]
+        company_location = extracted["company_location"]
+
+    # Enforce extracted company name and location
+    if company_name:
+        data.setdefault("recipient", {})
+        data["recipient"]["company"] = company_name
+    if company_location:
+        data.setdefault("recipient", {})
+        data["recipient"]["address"] = company_location
+
+    # Generate DOCX
+    file_bytes = await run_blocking(render_cover_letter, data)
+    if not file_bytes:
+        raise ValueError("Failed to create cover letter document")
+
+    # Generate dynamic filename
+    safe_name = sanitize_filename(data.get("name", "Candidate"))
+    recipient_company = data.get("recipient", {}).get("company", "Company")
+    safe_company = sanitize_filename(recipient_company)
+    date_str = datetime.now().strftime("%Y-%m-%d")
+
+    return {
+        "preview": data.get("preview_markdown", "Cover letter generated successfully."),
+        "filename": f"CoverLetter_{safe_name}_{safe_company}_{date_str}.docx",
+        "content": file_bytes,
+    }
+
+
+async def generate_cover_letter_tool(
+    resume_text: str, job_description: str, mode: str = None, on_preview=None
+) -> str:
+    """
+    Generates a cover letter and returns a JSON string with 'preview' (markdown) and a reference
+    to the DOCX in the artifact store ('artifact_id', 'uri', 'path', 'filename', ...).
+    See generate_cover_letter_document for mode and on_preview.
+    """
+    try:
+        document = await generate_cover_letter_document(resume_text, job_description, mode, on_preview)
     except Exception as e:
         return json.dumps({"error": f"Failed to generate cover letter: {str(e)}"})
+
+    result = {
+        "preview": document["preview"],
+        **get_artifact_store().put(document["content"], document["filename"]),
+    }
+    return json.dumps(result)
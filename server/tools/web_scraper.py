@@ -1,50 +1,214 @@
+import os
+import time
+import random
+import asyncio
 import logging
+import contextlib
+from urllib.parse import urlparse
+import importlib.util
 import httpx
-from bs4 import BeautifulSoup
+from tools.concurrency import run_blocking, run_io
+from tools.page_cache import get_page_cache
+from tools.extract import extract_job_text
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def scrape_job_description_tool(url: str) -> str:
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# Pages larger than this are truncated rather than downloaded in full
+MAX_BYTES = int(os.getenv("SCRAPER_MAX_BYTES", str(2 * 1024 * 1024)))
+
+_http_client = None
+
+# Per-host [semaphore, users] shared by all requests, so concurrent batches stay polite too.
+# A host's entry is dropped once nothing is running or waiting for it.
+_host_slots = {}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide scraping client (HTTP/2 when the h2 package is installed)."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            follow_redirects=True,
+            headers=HEADERS,
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("SCRAPER_MAX_CONNECTIONS", "20")),
+                max_keepalive_connections=int(os.getenv("SCRAPER_MAX_KEEPALIVE", "10")),
+            ),
+            timeout=httpx.Timeout(
+                connect=float(os.getenv("SCRAPER_CONNECT_TIMEOUT", "5")),
+                read=float(os.getenv("SCRAPER_READ_TIMEOUT", "15")),
+                write=10.0,
+                pool=10.0,
+            ),
+        )
+    return _http_client
+
+
+@contextlib.asynccontextmanager
+async def _host_slot(host: str, limit: int):
+    """Hold one of host's `limit` concurrent request slots for the block."""
+    entry = _host_slots.get(host)
+    if entry is None:
+        entry = _host_slots[host] = [asyncio.Semaphore(limit), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _host_slots[host]
+
+
+async def _read_capped(response: httpx.Response) -> str:
+    """Stream the body, stopping at MAX_BYTES."""
+    chunks = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= MAX_BYTES:
+            logger.warning(f"Response from {response.url} exceeded {MAX_BYTES} bytes, truncating")
+            break
+    body = b"".join(chunks)[:MAX_BYTES]
+    return body.decode(response.encoding or "utf-8", errors="replace")
+
+
+async def fetch_page(url: str, headers: dict = None):
+    """
+    Fetch a page over the shared client, bounded by SCRAPER_TOTAL_TIMEOUT.
+    Returns (status_code, response_headers, html); html is empty for a 304.
+    """
+    client = get_http_client()
+
+    async def fetch():
+        async with client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304:
+                return 304, response.headers, ""
+            response.raise_for_status()
+            return response.status_code, response.headers, await _read_capped(response)
+
+    return await asyncio.wait_for(fetch(), float(os.getenv("SCRAPER_TOTAL_TIMEOUT", "20")))
+
+
+def _retry_delay(attempt: int, response: httpx.Response = None) -> float:
+    """Honor Retry-After (seconds) when present, otherwise jittered exponential backoff."""
+    if response is not None:
+        retry_after = response.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), 60.0)
+    base = float(os.getenv("SCRAPER_RETRY_BACKOFF", "1"))
+    return base * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+async def _fetch_with_retry(url: str, headers: dict = None):
+    """fetch_page, retrying 429/5xx responses and transport errors up to SCRAPER_MAX_RETRIES times."""
+    max_retries = int(os.getenv("SCRAPER_MAX_RETRIES", "3"))
+    for attempt in range(max_retries + 1):
+        try:
+            return await fetch_page(url, headers)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code not in RETRY_STATUSES or attempt == max_retries:
+                raise
+            delay = _retry_delay(attempt, e.response)
+        except (httpx.TransportError, asyncio.TimeoutError):
+            if attempt == max_retries:
+                raise
+            delay = _retry_delay(attempt)
+        logger.info(f"Retrying {url} in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+        await asyncio.sleep(delay)
+
+
+async def _scrape(url: str) -> str:
+    """Return the job description text for url, from the page cache when possible. Raises on failure."""
+    cache = get_page_cache()
+    cached = await run_io(cache.get, url)
+    if cached and cached["fresh"]:
+        logger.info(f"Page cache hit for {url}")
+        return cached["text"]
+
+    status, headers, html = await _fetch_with_retry(url, cached["validators"] if cached else None)
+    if status == 304 and cached:
+        logger.info(f"Page not modified, serving cached copy of {url}")
+        await run_io(cache.revalidated, url)
+        return cached["text"]
+
+    # Parsing is CPU-bound, keep it off the event loop
+    text = await run_blocking(extract_job_text, html, url)
+    if text:
+        # An empty extraction is retried on the next request rather than cached for PAGE_CACHE_TTL
+        await run_io(cache.put, url, html, text, headers.get("etag"), headers.get("last-modified"))
+    return text
+
+
+async def scrape_job_description_tool(url: str) -> str:
     """
     Scrapes the job description from a given URL.
-    
+
     Args:
         url: The URL of the job posting.
-        
+
     Returns:
         The text content of the job description, or an error message.
     """
     logger.info(f"Scraping job description from {url}")
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    
+
     try:
-        with httpx.Client(follow_redirects=True, headers=headers) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-                
-            # Get text
-            text = soup.get_text(separator="\n")
-            
-            # Break into lines and remove leading/trailing space on each
-            lines = (line.strip() for line in text.splitlines())
-            # Break multi-headlines into a line each
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            # Drop blank lines
-            text = '\n'.join(chunk for chunk in chunks if chunk)
-            
-            # Limit length to avoid context window issues (approx 10k chars)
-            return text[:10000]
-            
+        return await _scrape(url)
+    except asyncio.TimeoutError:
+        logger.error(f"Timed out scraping URL: {url}")
+        return "Error scraping URL: timed out"
     except Exception as e:
         logger.error(f"Error scraping URL: {e}")
         return f"Error scraping URL: {str(e)}"
+
+
+async def scrape_job_descriptions_tool(urls: list, on_result=None) -> list:
+    """
+    Scrapes several job URLs concurrently, at most SCRAPER_BATCH_CONCURRENCY at once
+    and SCRAPER_PER_HOST_CONCURRENCY per host.
+
+    Args:
+        urls: The job posting URLs (duplicates are fetched once).
+        on_result: Optional async callback(result, done, total) called as each URL finishes.
+
+    Returns:
+        One dict per URL in input order: {"url", "text"} on success or {"url", "error"} on failure.
+    """
+    max_urls = int(os.getenv("SCRAPER_BATCH_MAX_URLS", "20"))
+    urls = list(dict.fromkeys(urls))[:max_urls]
+    batch_limit = asyncio.Semaphore(int(os.getenv("SCRAPER_BATCH_CONCURRENCY", "8")))
+    per_host = int(os.getenv("SCRAPER_PER_HOST_CONCURRENCY", "2"))
+
+    async def scrape_one(url: str) -> dict:
+        host = urlparse(url).netloc.lower()
+        start = time.perf_counter()
+        try:
+            # Host slot first: waiting on a busy host must not hold a batch slot idle hosts could use
+            async with _host_slot(host, per_host), batch_limit:
+                text = await _scrape(url)
+            return {"url": url, "text": text}
+        except asyncio.TimeoutError:
+            return {"url": url, "error": "timed out"}
+        except Exception as e:
+            return {"url": url, "error": str(e).splitlines()[0] if str(e) else type(e).__name__}
+        finally:
+            logger.info(f"Scraped {url} in {time.perf_counter() - start:.2f}s")
+
+    logger.info(f"Scraping {len(urls)} job descriptions")
+    results = {}
+    for finished in asyncio.as_completed([scrape_one(url) for url in urls]):
+        result = await finished
+        results[result["url"]] = result
+        if on_result is not None:
+            await on_result(result, len(results), len(urls))
+
+    return [results[url] for url in urls]